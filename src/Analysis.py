@@ -1,23 +1,204 @@
+import functools
+import importlib
 import math
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from statistics import NormalDist
 
-import matplotlib.pyplot as plt
 import numpy as np
+from EventParser import IterSelectedFourVectors, ReadSelectedFourVectors, SplitAtEvents
+from ConvertCsv import IterPythiaCsvFourVectors, ReadPythiaCsvFourVectors
+from FourVectorArray import FourVectorArray
+from BinnedStatistics import Histogram, ChiSquareTest, LikelihoodRatioTest, BinnedKSTest
+from KolmogorovSmirnov import KolmogorovPvalue, KSTest
+from StreamingStatistics import PairedAccumulator, SketchKSDistance
+from Resampling import ResamplingEngine, DEFAULT_RESAMPLES, DEFAULT_SEED
 
-try:
-    import seaborn as sns
-except Exception:
-    sns = None
 
-try:
-    from scipy import stats as scipy_stats
-except Exception:
-    scipy_stats = None
+STANDARD_NORMAL = NormalDist()
 
 
-STANDARD_NORMAL = NormalDist()
+@functools.lru_cache(maxsize=None)
+def _OptionalModule(name):
+    """
+    Imports an optional dependency (SciPy, seaborn) the first time it is needed.
+    Plotting and statistics libraries take a long time to import, so runs that
+    only generate events should not pay for them. Gives None when not installed.
+    """
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def _CosTheta(vectors):
+    momentumMag = vectors.p
+    # Particles at rest have no direction: use 0, like ExtractObservable
+    cosTheta = np.zeros(len(vectors))
+    np.divide(vectors.pz, momentumMag, out=cosTheta, where=momentumMag != 0)
+    return cosTheta
+
+
+# Observables that can be computed from the selected particle of every event.
+# The names follow the FourVector properties; FourVectorArray evaluates them for all events at once.
+OBSERVABLES = {
+    "e": lambda vectors: vectors.e,
+    "px": lambda vectors: vectors.px,
+    "py": lambda vectors: vectors.py,
+    "pz": lambda vectors: vectors.pz,
+    "p": lambda vectors: vectors.p,
+    "pt": lambda vectors: vectors.pt,
+    "eta": lambda vectors: vectors.eta,
+    "phi": lambda vectors: vectors.phi,
+    "inv_mass": lambda vectors: vectors.inv_mass,
+    "cosTheta": _CosTheta,
+}
+
+
+def ComputeObservables(p4, observables):
+    """
+    Computes several observables from an (N, 4) array of four-vectors in one pass.
+    Returns a structured array with one float field per observable name.
+    """
+    unknown = [name for name in observables if name not in OBSERVABLES]
+    if unknown:
+        raise ValueError(f"Unknown observable(s) {unknown}, choose from {list(OBSERVABLES)}")
+
+    vectors = FourVectorArray(p4)
+    table = np.empty(len(vectors), dtype=[(name, float) for name in observables])
+    for name in observables:
+        table[name] = OBSERVABLES[name](vectors)
+    return table
+
+
+# Number of bins and histogram ranges used by the binned comparison mode.
+# Observables without a natural range need an entry in 'binRanges'.
+DEFAULT_BINS = 50
+DEFAULT_BIN_RANGES = {"cosTheta": (-1.0, 1.0), "phi": (-math.pi, math.pi)}
+
+
+def HistogramFile(filePath, pdgToFind, edges, start=0, end=None):
+    """
+    Streams one input file into one Histogram per observable, where 'edges'
+    maps observable name -> bin edges. Only one block of events is in memory
+    at a time. 'start' and 'end' restrict text files to a byte range from SplitAtEvents.
+    """
+    histograms = {name: Histogram(binEdges) for name, binEdges in edges.items()}
+    if Path(filePath).suffix.lower() == ".csv":
+        blocks = IterPythiaCsvFourVectors(filePath, pdgToFind)
+    else:
+        blocks = IterSelectedFourVectors(filePath, pdgToFind, start=start, end=end)
+
+    for p4 in blocks:
+        values = ComputeObservables(p4, list(edges))
+        for name, histogram in histograms.items():
+            histogram.Fill(values[name])
+    return histograms
+
+
+def _IterFourVectorBlocks(filePath, pdgToFind):
+    filePath = Path(filePath)
+    if not filePath.is_absolute() and not filePath.exists():
+        filePath = Path(__file__).resolve().parent.parent / "outputs" / filePath
+    if filePath.suffix.lower() == ".csv":
+        return IterPythiaCsvFourVectors(filePath, pdgToFind)
+    return IterSelectedFourVectors(filePath, pdgToFind)
+
+
+def _PairedBlocks(ourBlocks, pythiaBlocks):
+    """Cuts two streams of (n, 4) blocks into pieces holding the same events of both."""
+    ourBlocks = (block for block in ourBlocks if len(block))
+    pythiaBlocks = (block for block in pythiaBlocks if len(block))
+    ourRest, pythiaRest = next(ourBlocks, None), next(pythiaBlocks, None)
+
+    while ourRest is not None and pythiaRest is not None:
+        n = min(len(ourRest), len(pythiaRest))
+        yield ourRest[:n], pythiaRest[:n]
+        # Keep what is left of the longer piece, fetch the next block for the other side
+        ourRest = ourRest[n:] if n < len(ourRest) else next(ourBlocks, None)
+        pythiaRest = pythiaRest[n:] if n < len(pythiaRest) else next(pythiaBlocks, None)
+
+    if ourRest is not None or pythiaRest is not None:
+        raise ValueError("Event samples must have same length for paired test.")
+
+
+def AccumulateFiles(genOurFile, genPythiaFile, pdgToFind=None, observables=("cosTheta",), edges=None):
+    """
+    Streams the events of both files into one PairedAccumulator per observable.
+    A worker can run this on its own pair of files (a shard of a production);
+    the accumulators of all shards are then merged and handed to
+    SimulatorComparison.FromAccumulators. 'edges' optionally maps observable
+    name -> bin edges to fill histograms for the binned tests as well.
+    """
+    edges = edges or {}
+    accumulators = {name: PairedAccumulator(edges.get(name)) for name in observables}
+    blocks = _PairedBlocks(_IterFourVectorBlocks(genOurFile, pdgToFind),
+                           _IterFourVectorBlocks(genPythiaFile, pdgToFind))
+    for ourP4, pythiaP4 in blocks:
+        ourValues = ComputeObservables(ourP4, list(observables))
+        pythiaValues = ComputeObservables(pythiaP4, list(observables))
+        for name, accumulator in accumulators.items():
+            accumulator.Update(ourValues[name], pythiaValues[name])
+    return accumulators
+
+
+# Chebyshev fit of erfc(x) = t exp(-x^2 + P(t)), t = 1 / (1 + x/2), from Numerical Recipes.
+# Highest power first, for np.polyval; the relative error is below 1.2e-7 for every x
+ERFC_COEFFICIENTS = (0.17087277, -0.82215223, 1.48851587, -1.13520398, 0.27886807,
+                     -0.18628806, 0.09678418, 0.37409196, 1.00002368, -1.26551223)
+
+
+def TwoSidedNormalPvalues(stats):
+    """
+    Two-sided p-values erfc(|z| / sqrt(2)) of an array of normal statistics, in one
+    NumPy pass. NumPy has no erfc and SciPy is optional, so this uses the fit above;
+    unlike 1 - cdf it keeps its relative accuracy far out in the tails.
+    """
+    x = np.abs(np.asarray(stats, dtype=np.float64)) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * x)
+    with np.errstate(invalid="ignore", over="ignore"):
+        pValues = t * np.exp(-x * x + np.polyval(ERFC_COEFFICIENTS, t))
+    return np.clip(pValues, 0.0, 1.0)
+
+
+def PvalueToSigma(pVal):
+    """
+    Converts a probability (p-value) into 'Sigma'.
+    In physics, 5-sigma is the 'Gold Standard' for claiming a discovery.
+    """
+    if np.isnan(pVal):
+        return np.nan
+    if pVal <= 0:
+        return np.inf
+    if pVal >= 1:
+        return 0.0
+
+    tailProbability = 1.0 - pVal / 2.0
+    tailProbability = min(math.nextafter(1.0, 0.0), tailProbability)
+    tailProbability = max(math.nextafter(0.0, 1.0), tailProbability)
+    return STANDARD_NORMAL.inv_cdf(tailProbability)
+
+
+def InterpretSignificance(pVal):
+    """Translates statistical numbers into physics-standard terminology."""
+    sigma = PvalueToSigma(pVal)
+
+    if sigma >= 5:
+        level = "5σ (Discovery)"
+        significant = True
+    elif sigma >= 3:
+        level = "3σ (Evidence)"
+        significant = True
+    elif sigma >= 2:
+        level = "2σ (Tension)"
+        significant = False
+    else:
+        level = "< 2σ (Compatible)"
+        significant = False
+
+    return sigma, level, significant
 
 
 class SimulatorComparison:
@@ -26,61 +207,214 @@ class SimulatorComparison:
     against the industry-standard PYTHIA generator.
     """
 
-    def __init__(self, genOurFile, genPythiaFile, labels=None, pdgToFind=None):
-        # Load the raw event data from text files into memory
-        self.genOur = self.DeserializeFile(genOurFile, pdgToFind)
-        self.genPythia = self.DeserializeFile(genPythiaFile, pdgToFind)
-
-        # Convert to NumPy arrays to allow for fast vector math
-        # and statistical operations.
-        self.genOur = np.array(self.genOur, dtype=float)
-        self.genPythia = np.array(self.genPythia, dtype=float)
+    def __init__(self, genOurFile, genPythiaFile, labels=None, pdgToFind=None, observables=None,
+                 nWorkers=None, binned=False, bins=DEFAULT_BINS, binRanges=None):
+        # Every observable is computed during the single read of each file;
+        # the comparison then works on one of them at a time (see SelectObservable).
+        self.observables = list(observables) if observables else ["cosTheta"]
+        self.binned = binned
+        self.accumulators = None
+
+        if binned:
+            # Binned mode: the files are streamed into fixed histograms and no
+            # per-event values are kept, so memory does not grow with the event count.
+            edges = self._BinEdges(bins, binRanges)
+            self.ourHistograms, self.pythiaHistograms = self.HistogramFiles(
+                [genOurFile, genPythiaFile], pdgToFind, edges, nWorkers)
+        # Load the raw event data from text files into memory.
+        # With 'nWorkers' both files are parsed at the same time in a process pool.
+        elif nWorkers is None:
+            self.ourTable = self.DeserializeFile(genOurFile, pdgToFind, self.observables)
+            self.pythiaTable = self.DeserializeFile(genPythiaFile, pdgToFind, self.observables)
+        else:
+            self.ourTable, self.pythiaTable = self.DeserializeFiles(
+                [genOurFile, genPythiaFile], pdgToFind, self.observables, nWorkers)
 
         # Labels for the X-axis of the final comparison plots
         if labels is not None:
             self.labels = labels
+        elif observables:
+            self.labels = list(self.observables)
         else:
             self.labels = ["Observable"]
 
         self.delta = None
+        self.SelectObservable(self.observables[0])
+
+    @classmethod
+    def FromHistograms(cls, ourHistograms, pythiaHistograms, labels=None):
+        """
+        A binned comparison built from existing histograms (dicts of observable
+        name -> Histogram), e.g. histograms of several runs added together.
+        """
+        comparison = cls.__new__(cls)
+        comparison.observables = list(ourHistograms)
+        comparison.binned = True
+        comparison.accumulators = None
+        comparison.ourHistograms = {name: ourHistograms[name].Copy() for name in comparison.observables}
+        comparison.pythiaHistograms = {name: pythiaHistograms[name].Copy() for name in comparison.observables}
+        comparison.labels = labels if labels is not None else list(comparison.observables)
+        comparison.delta = None
+        comparison.SelectObservable(comparison.observables[0])
+        return comparison
+
+    @classmethod
+    def FromAccumulators(cls, accumulators, labels=None):
+        """
+        A comparison built from merged PairedAccumulators (dict of observable name
+        -> accumulator, see AccumulateFiles). PairedTTest and KSTest then work on
+        the accumulated moments and quantile sketches and return the usual
+        result dicts; the Binned* tests are available if histograms were filled.
+        """
+        comparison = cls.__new__(cls)
+        comparison.observables = list(accumulators)
+        comparison.binned = True
+        comparison.accumulators = dict(accumulators)
+        comparison.ourHistograms = {name: acc.ourHistogram for name, acc in accumulators.items()}
+        comparison.pythiaHistograms = {name: acc.pythiaHistogram for name, acc in accumulators.items()}
+        comparison.labels = labels if labels is not None else list(comparison.observables)
+        comparison.delta = None
+        comparison.SelectObservable(comparison.observables[0])
+        return comparison
+
+    def MergeHistograms(self, other):
+        """Adds the histograms of another binned comparison (e.g. a further run) to this one."""
+        if not (self.binned and other.binned):
+            raise ValueError("Only binned comparisons can be merged")
+        for name in self.observables:
+            self.ourHistograms[name] += other.ourHistograms[name]
+            self.pythiaHistograms[name] += other.pythiaHistograms[name]
+
+    def SelectObservable(self, name):
+        """Makes 'name' the observable used by the tests and plots."""
+        if name not in self.observables:
+            raise ValueError(f"Observable '{name}' was not loaded, choose from {self.observables}")
+
+        if self.binned:
+            self.histOur = self.ourHistograms[name]
+            self.histPythia = self.pythiaHistograms[name]
+            self.accumulator = self.accumulators[name] if self.accumulators is not None else None
+            self.genOur = self.genPythia = None
+        else:
+            # Plain float arrays allow for fast vector math and statistical operations
+            self.genOur = np.ascontiguousarray(self.ourTable[name], dtype=float)
+            self.genPythia = np.ascontiguousarray(self.pythiaTable[name], dtype=float)
+        self.observable = name
+        self.delta = None
+
+    def DeserializeFile(self, fileName, pdgToFind=None, observables=None):
+        """
+        Reads a simulation output file (text format, or a PYTHIA .csv) and
+        extracts specific particle data.
+        Without 'observables' this is cos(theta) per event; with a list of names
+        (see OBSERVABLES) it is a structured array with one field per name.
+        """
+        filePath = self._InputPath(fileName)
+
+        # The block parser picks the same particle per event as ExtractObservable,
+        # but decodes all selected four-vectors at once into an (nEvents, 4) array.
+        # PYTHIA CSV files are read directly, without the rounded text intermediate.
+        if filePath.suffix.lower() == ".csv":
+            p4 = ReadPythiaCsvFourVectors(filePath, pdgToFind)
+        else:
+            p4 = ReadSelectedFourVectors(filePath, pdgToFind)
+        return self._Observables(p4, observables)
 
-    def DeserializeFile(self, fileName, pdgToFind=None):
+    def DeserializeFiles(self, fileNames, pdgToFind=None, observables=None, nWorkers=None):
         """
-        Reads a simulation output file and extracts specific particle data.
+        Parallel version of DeserializeFile for several files at once.
+        Text files are cut into parts at 'Event' boundaries (about one per worker)
+        and all parts of all files are parsed concurrently in a process pool.
+        The parts are joined back in file order, so the result equals calling
+        DeserializeFile on each file up to rounding (vectorized math functions may
+        round the last bit differently depending on array layout, ~1e-16).
+        CSV files are read as one part each.
+        Scripts calling this must guard their entry point with
+        'if __name__ == "__main__":' on platforms that spawn worker processes.
         """
+        filePaths = [self._InputPath(fileName) for fileName in fileNames]
+
+        nParts = nWorkers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=nParts) as pool:
+            futures = []
+            for filePath in filePaths:
+                if filePath.suffix.lower() == ".csv":
+                    futures.append([pool.submit(ReadPythiaCsvFourVectors, filePath, pdgToFind)])
+                else:
+                    futures.append([pool.submit(ReadSelectedFourVectors, filePath, pdgToFind, start=start, end=end)
+                                    for start, end in SplitAtEvents(filePath, nParts)])
+
+            results = []
+            for fileFutures in futures:
+                p4 = np.concatenate([future.result() for future in fileFutures] + [np.zeros((0, 4))])
+                results.append(self._Observables(p4, observables))
+        return results
+
+    def HistogramFiles(self, fileNames, pdgToFind=None, edges=None, nWorkers=None):
+        """
+        Binned counterpart of DeserializeFile(s): streams every file into one
+        Histogram per observable (see HistogramFile) and returns one dict per file.
+        With 'nWorkers' the files are cut into parts like in DeserializeFiles;
+        every worker returns only its small histograms, which are added up here.
+        """
+        filePaths = [self._InputPath(fileName) for fileName in fileNames]
+        if nWorkers is None:
+            return [HistogramFile(filePath, pdgToFind, edges) for filePath in filePaths]
+
+        nParts = nWorkers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=nParts) as pool:
+            futures = []
+            for filePath in filePaths:
+                if filePath.suffix.lower() == ".csv":
+                    futures.append([pool.submit(HistogramFile, filePath, pdgToFind, edges)])
+                else:
+                    futures.append([pool.submit(HistogramFile, filePath, pdgToFind, edges, start, end)
+                                    for start, end in SplitAtEvents(filePath, nParts)])
+
+            results = []
+            for fileFutures in futures:
+                histograms = {name: Histogram(binEdges) for name, binEdges in edges.items()}
+                for future in fileFutures:
+                    for name, partHistogram in future.result().items():
+                        histograms[name] += partHistogram
+                results.append(histograms)
+        return results
+
+    def _BinEdges(self, bins, binRanges):
+        """Bin edges per observable: explicit edges, or 'bins' equal bins over its range."""
+        if not np.isscalar(bins):
+            return {name: np.asarray(bins, dtype=float) for name in self.observables}
+
+        ranges = dict(DEFAULT_BIN_RANGES, **(binRanges or {}))
+        missing = [name for name in self.observables if name not in ranges]
+        if missing:
+            raise ValueError(f"Binned mode needs a histogram range for {missing} (pass binRanges)")
+        return {name: np.linspace(*ranges[name], int(bins) + 1) for name in self.observables}
+
+    def _RequireEvents(self, testName):
+        # Tests on individual events cannot be run on histograms
+        if self.binned:
+            raise ValueError(f"{testName} needs the per-event values; "
+                             "use the Binned* tests in binned mode")
+
+    def _RequireHistograms(self):
+        if not self.binned or self.histOur is None:
+            raise ValueError("The binned tests need histograms: use binned=True or accumulators with edges")
+
+    def _InputPath(self, fileName):
         # Finds the directory where the code is located to build a file path
         projectRoot = Path(__file__).resolve().parent.parent
         filePath = projectRoot / "outputs" / fileName
 
         if not filePath.exists():
             raise FileNotFoundError(f"Could not find file: {filePath}")
+        return filePath
 
-        observables = []
-
-        with open(filePath, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-        currentEvent = []
-
-        # Particles are grouped into 'Events' (one 'collision' per event)
-        for line in lines:
-            line = line.strip()
-
-            if line.startswith("Event"):
-                if currentEvent:
-                    # Process the data for the event just finished
-                    obs = self.ExtractObservable(currentEvent, pdgToFind)
-                    observables.append(obs)
-                    currentEvent = []
-            elif line:
-                currentEvent.append(line)
-
-        # Catch the last event in the file
-        if currentEvent:
-            obs = self.ExtractObservable(currentEvent, pdgToFind)
-            observables.append(obs)
-
-        return observables
+    def _Observables(self, p4, observables):
+        if observables is None:
+            return _CosTheta(FourVectorArray(p4))
+        return ComputeObservables(p4, observables)
 
     def ExtractObservable(self, eventLines, pdgToFind=None):
         """
@@ -108,8 +442,9 @@ class SimulatorComparison:
         if len(numbers) < 4:
             raise ValueError(f"Could not parse momentum from line:\\n{selectedLine}")
 
-        # E=Energy, px/py/pz = Momentum components in 3D space
-        energy, px, py, pz = map(float, numbers[:4])
+        # E=Energy, px/py/pz = Momentum components in 3D space.
+        # They are the last four numbers: the line starts with the index and PDG code.
+        energy, px, py, pz = map(float, numbers[-4:])
 
         # Calculate the total length of the momentum vector (the 'speed' of the particle)
         momentumMag = np.sqrt(px ** 2 + py ** 2 + pz ** 2)
@@ -125,6 +460,7 @@ class SimulatorComparison:
 
     def ComputeDifference(self):
         """Calculates the direct gap between our generator and Pythia."""
+        self._RequireEvents("ComputeDifference")
         self.delta = self.genOur - self.genPythia
         return self.delta
 
@@ -135,7 +471,7 @@ class SimulatorComparison:
         stat = float(stat)
         pVal = float(pVal)
 
-        if np.isnan(stat) or np.isnan(pVal):
+        if (np.isnan(stat) or np.isnan(pVal)) and not self.binned:
             delta = self.ComputeDifference()
             if np.allclose(delta, 0.0):
                 return 0.0, 1.0
@@ -144,14 +480,12 @@ class SimulatorComparison:
 
     def _manual_paired_t_test(self):
         delta = self.ComputeDifference()
-        n = delta.size
+        return self._paired_t_from_moments(delta.size, float(np.mean(delta)), float(np.std(delta, ddof=1)))
 
+    def _paired_t_from_moments(self, n, meanDelta, stdDelta):
         if n < 2:
             raise ValueError("At least two paired events are required for the t-test.")
 
-        meanDelta = float(np.mean(delta))
-        stdDelta = float(np.std(delta, ddof=1))
-
         if np.isclose(stdDelta, 0.0):
             if np.isclose(meanDelta, 0.0):
                 return 0.0, 1.0
@@ -162,75 +496,17 @@ class SimulatorComparison:
         return tStat, pVal
 
     def _kolmogorov_pvalue(self, dStat, n1, n2):
-        if dStat <= 0:
-            return 1.0
-
-        effectiveN = math.sqrt((n1 * n2) / (n1 + n2))
-        if effectiveN == 0:
-            return 1.0
-
-        lam = (effectiveN + 0.12 + 0.11 / effectiveN) * dStat
-        total = 0.0
-
-        for k in range(1, 200):
-            term = math.exp(-2.0 * (k ** 2) * (lam ** 2))
-            total += ((-1) ** (k - 1)) * term
-            if term < 1e-12:
-                break
-
-        return max(0.0, min(1.0, 2.0 * total))
+        return KolmogorovPvalue(dStat, n1, n2)
 
     def _manual_ks_test(self):
-        sample1 = np.sort(self.genOur)
-        sample2 = np.sort(self.genPythia)
-        n1 = sample1.size
-        n2 = sample2.size
-
-        if n1 == 0 or n2 == 0:
-            raise ValueError("Both samples must contain at least one event for the KS test.")
-
-        combined = np.concatenate((sample1, sample2))
-        cdf1 = np.searchsorted(sample1, combined, side="right") / n1
-        cdf2 = np.searchsorted(sample2, combined, side="right") / n2
-        dStat = float(np.max(np.abs(cdf1 - cdf2)))
-        pVal = self._kolmogorov_pvalue(dStat, n1, n2)
-        return dStat, pVal
+        # One merge of the sorted samples for D; exact p-value for small samples
+        return KSTest(self.genOur, self.genPythia)
 
     def PvalueToSigma(self, pVal):
-        """
-        Converts a probability (p-value) into 'Sigma'.
-        In physics, 5-sigma is the 'Gold Standard' for claiming a discovery.
-        """
-        if np.isnan(pVal):
-            return np.nan
-        if pVal <= 0:
-            return np.inf
-        if pVal >= 1:
-            return 0.0
-
-        tailProbability = 1.0 - pVal / 2.0
-        tailProbability = min(math.nextafter(1.0, 0.0), tailProbability)
-        tailProbability = max(math.nextafter(0.0, 1.0), tailProbability)
-        return STANDARD_NORMAL.inv_cdf(tailProbability)
+        return PvalueToSigma(pVal)
 
     def InterpretSignificance(self, pVal):
-        """Translates statistical numbers into physics-standard terminology."""
-        sigma = self.PvalueToSigma(pVal)
-
-        if sigma >= 5:
-            level = "5σ (Discovery)"
-            significant = True
-        elif sigma >= 3:
-            level = "3σ (Evidence)"
-            significant = True
-        elif sigma >= 2:
-            level = "2σ (Tension)"
-            significant = False
-        else:
-            level = "< 2σ (Compatible)"
-            significant = False
-
-        return sigma, level, significant
+        return InterpretSignificance(pVal)
 
     def PairedTTest(self):
         """
@@ -238,14 +514,22 @@ class SimulatorComparison:
         Used to see if our generator has a 'bias' compared to Pythia.
         """
         implementation = "Fallback"
-
-        if scipy_stats is not None:
+        scipy_stats = _OptionalModule("scipy.stats")
+
+        if self.binned and self.accumulator is not None:
+            # Streaming mode: the statistic comes from the merged moments of the difference
+            moments = self.accumulator.deltaMoments
+            tStat, pVal = self._paired_t_from_moments(moments.count, moments.mean, moments.Std())
+            implementation = "Streaming"
+        elif scipy_stats is not None:
+            self._RequireEvents("PairedTTest")
             try:
                 tStat, pVal = scipy_stats.ttest_rel(self.genOur, self.genPythia)
                 implementation = "SciPy"
             except Exception:
                 tStat, pVal = self._manual_paired_t_test()
         else:
+            self._RequireEvents("PairedTTest")
             tStat, pVal = self._manual_paired_t_test()
 
         tStat, pVal = self._sanitize_result(tStat, pVal)
@@ -264,8 +548,22 @@ class SimulatorComparison:
     def KSTest(self):
         """Compares the full observable distributions of both generators."""
         implementation = "Fallback"
-
-        if scipy_stats is not None:
+        scipy_stats = _OptionalModule("scipy.stats")
+        dError = None
+
+        if self.binned and self.accumulator is not None:
+            # Streaming mode: D from the quantile sketches. Beyond the sketch capacity this
+            # is approximate: each sketch CDF may be off by up to its CdfError(), and the
+            # noise mostly inflates D. The p-value is taken at the smallest D the exact
+            # samples could have, so it is never smaller than the exact one (no false
+            # "DIFFERENT" from the sketch), at the cost of some power.
+            ourSketch, pythiaSketch = self.accumulator.ourSketch, self.accumulator.pythiaSketch
+            dStat = SketchKSDistance(ourSketch, pythiaSketch)
+            dError = ourSketch.CdfError() + pythiaSketch.CdfError()
+            pVal = KolmogorovPvalue(max(dStat - dError, 0.0), ourSketch.count, pythiaSketch.count)
+            implementation = "Streaming"
+        elif scipy_stats is not None:
+            self._RequireEvents("KSTest")
             try:
                 result = scipy_stats.ks_2samp(self.genOur, self.genPythia)
                 dStat, pVal = result.statistic, result.pvalue
@@ -273,12 +571,13 @@ class SimulatorComparison:
             except Exception:
                 dStat, pVal = self._manual_ks_test()
         else:
+            self._RequireEvents("KSTest")
             dStat, pVal = self._manual_ks_test()
 
         dStat, pVal = self._sanitize_result(dStat, pVal)
         sigma, level, significant = self.InterpretSignificance(pVal)
 
-        return {
+        result = {
             "test": "Kolmogorov-Smirnov test",
             "dStat": dStat,
             "pVal": pVal,
@@ -287,6 +586,96 @@ class SimulatorComparison:
             "significant": significant,
             "implementation": implementation,
         }
+        if dError is not None:
+            # Bound on |D - exact D| of the streaming sketches
+            result["dError"] = dError
+        return result
+
+    def PermutationTTest(self, nResamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, nWorkers=None):
+        """
+        Paired t-test with a permutation p-value instead of the asymptotic one:
+        the signs of the event-by-event differences are flipped at random.
+        Reliable for small samples as well (see Resampling).
+        """
+        self._RequireEvents("PermutationTTest")
+        engine = ResamplingEngine(nResamples, seed, nWorkers)
+        tStat, pVal = engine.PairedTPermutation(self.genOur, self.genPythia)
+        sigma, level, significant = self.InterpretSignificance(pVal)
+
+        return {
+            "test": "Paired t-test (permutation)",
+            "tStat": tStat,
+            "pVal": pVal,
+            "sigma": sigma,
+            "level": level,
+            "significant": significant,
+            "implementation": "Permutation",
+            "nResamples": nResamples,
+        }
+
+    def PermutationKSTest(self, nResamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, nWorkers=None):
+        """KS test with a permutation p-value: the generator labels of all events are shuffled."""
+        self._RequireEvents("PermutationKSTest")
+        engine = ResamplingEngine(nResamples, seed, nWorkers)
+        dStat, pVal = engine.KSPermutation(self.genOur, self.genPythia)
+        sigma, level, significant = self.InterpretSignificance(pVal)
+
+        return {
+            "test": "Kolmogorov-Smirnov test (permutation)",
+            "dStat": dStat,
+            "pVal": pVal,
+            "sigma": sigma,
+            "level": level,
+            "significant": significant,
+            "implementation": "Permutation",
+            "nResamples": nResamples,
+        }
+
+    def BootstrapIntervals(self, nResamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, nWorkers=None,
+                           confidenceLevel=0.95):
+        """
+        Bootstrap confidence intervals of the mean difference, the t statistic and
+        the KS distance. Every entry is (estimate, low, high).
+        """
+        self._RequireEvents("BootstrapIntervals")
+        engine = ResamplingEngine(nResamples, seed, nWorkers, confidenceLevel)
+        intervals = engine.PairedTBootstrap(self.genOur, self.genPythia)
+        intervals["dStat"] = engine.KSBootstrap(self.genOur, self.genPythia)
+        intervals["confidenceLevel"] = confidenceLevel
+        return intervals
+
+    def _BinnedResult(self, testName, statName, statValue, pVal, ndf=None):
+        sigma, level, significant = self.InterpretSignificance(pVal)
+        result = {
+            "test": testName,
+            statName: statValue,
+            "pVal": pVal,
+            "sigma": sigma,
+            "level": level,
+            "significant": significant,
+            "implementation": "Binned",
+        }
+        if ndf is not None:
+            result["ndf"] = ndf
+        return result
+
+    def BinnedChiSquareTest(self):
+        """Chi-square comparison of the shapes of both histograms (see BinnedStatistics)."""
+        self._RequireHistograms()
+        chi2, ndf, pVal = ChiSquareTest(self.histOur, self.histPythia)
+        return self._BinnedResult("Binned chi-square test", "chi2", chi2, pVal, ndf)
+
+    def BinnedLikelihoodRatioTest(self):
+        """Likelihood-ratio (G) test of both histograms coming from the same distribution."""
+        self._RequireHistograms()
+        gStat, ndf, pVal = LikelihoodRatioTest(self.histOur, self.histPythia)
+        return self._BinnedResult("Binned likelihood-ratio test", "gStat", gStat, pVal, ndf)
+
+    def BinnedKSTest(self):
+        """Kolmogorov-Smirnov test on the cumulative histograms."""
+        self._RequireHistograms()
+        dStat, pVal = BinnedKSTest(self.histOur, self.histPythia)
+        return self._BinnedResult("Binned Kolmogorov-Smirnov test", "dStat", dStat, pVal)
 
     def PrintResult(self, result):
         """Formats the statistical findings for the console."""
@@ -298,11 +687,19 @@ class SimulatorComparison:
             print(f"statistic    : {result['tStat']:.4f}")
         elif "dStat" in result:
             print(f"statistic    : {result['dStat']:.4f}")
+            if "dError" in result:
+                print(f"sketch error : <= {result['dError']:.1e} (p-value taken at D - error)")
+        elif "chi2" in result:
+            print(f"statistic    : {result['chi2']:.4f} (ndf = {result['ndf']})")
+        elif "gStat" in result:
+            print(f"statistic    : {result['gStat']:.4f} (ndf = {result['ndf']})")
 
         print(f"p-value      : {result['pVal']:.3e}")
         print(f"significance : {result['sigma']:.2f} σ")
         print(f"interpretation: {result['level']}")
         print(f"implementation: {result.get('implementation', 'N/A')}")
+        if "nResamples" in result:
+            print(f"resamples    : {result['nResamples']}")
 
         if result["significant"]:
             print("→ Null hypothesis rejected (Generators are DIFFERENT)")
@@ -311,10 +708,16 @@ class SimulatorComparison:
 
     def PlotDistributions(self):
         """Creates a visual overlay of both generators to see if the shapes match."""
+        import matplotlib.pyplot as plt
+
         plt.figure()
 
         # Seaborn is optional; the base requirements only guarantee Matplotlib.
-        if sns is not None:
+        sns = _OptionalModule("seaborn")
+        if self.binned:
+            plt.stairs(self.histOur.Density(), self.histOur.edges, label="Our Generator")
+            plt.stairs(self.histPythia.Density(), self.histPythia.edges, label="Pythia")
+        elif sns is not None:
             sns.histplot(self.genOur, label="Our Generator", kde=True, stat="density")
             sns.histplot(self.genPythia, label="Pythia", kde=True, stat="density")
         else:
@@ -322,14 +725,31 @@ class SimulatorComparison:
             plt.hist(self.genOur, bins=bins, density=True, alpha=0.5, label="Our Generator")
             plt.hist(self.genPythia, bins=bins, density=True, alpha=0.5, label="Pythia")
 
+        # One label per loaded observable, or a single label for the first one
+        index = self.observables.index(self.observable)
         plt.legend()
-        plt.xlabel(self.labels[0])
+        plt.xlabel(self.labels[index] if index < len(self.labels) else self.observable)
         plt.title("Generator Comparison")
         plt.tight_layout()
         plt.show()
 
     def Run(self):
         """The main execution loop for the comparison."""
+        if self.binned:
+            if self.accumulator is not None:
+                print(f"\nPaired events (accumulated): {self.accumulator.Count}")
+                print("\nRunning paired t-test...\n")
+                self.PrintResult(self.PairedTTest())
+            if self.histOur is not None:
+                print("\nComparing histograms...")
+                print(f"Our generator events   : {self.histOur.Total:.0f}")
+                print(f"Pythia generator events: {self.histPythia.Total:.0f}")
+                print("\nRunning binned chi-square test...\n")
+                self.PrintResult(self.BinnedChiSquareTest())
+                print("\nPlotting distributions...")
+                self.PlotDistributions()
+            return
+
         print("\nReading event files...")
         print(f"Our generator events   : {len(self.genOur)}")
         print(f"Pythia generator events: {len(self.genPythia)}")
@@ -0,0 +1,220 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from Analysis import ComputeObservables, InterpretSignificance, TwoSidedNormalPvalues
+from ConvertCsv import ReadPythiaCsvSelections
+from EventParser import ReadSelectionsFourVectors, SplitAtEvents
+from KolmogorovSmirnov import KSDistance, KSPvalues
+
+"""
+Batch validation of many distributions at once.
+A nightly check compares dozens of (observable, particle selection) pairs;
+building one SimulatorComparison per pair would parse both files once per pair.
+BatchComparison reads every file a single time for all particle selections,
+computes all observables per selection, runs the paired t-test and the KS test
+on all columns together and corrects the p-values for the number of tests.
+The result is one table (a NumPy structured array) with a row per test.
+"""
+
+# Multiple-testing corrections accepted by AdjustPvalues
+CORRECTIONS = ("holm", "bonferroni", "bh", "none")
+
+# One row of the results table; pdg 0 stands for the default selection
+# (second-to-last particle of every event, as in SimulatorComparison)
+RESULT_DTYPE = [
+    ("pdg", np.int64),
+    ("observable", "U16"),
+    ("test", "U8"),
+    ("nOur", np.int64),
+    ("nPythia", np.int64),
+    ("stat", np.float64),
+    ("pVal", np.float64),
+    ("pAdjusted", np.float64),
+    ("sigma", np.float64),
+    ("significant", bool),
+]
+
+
+def AdjustPvalues(pValues, method="holm"):
+    """
+    Corrects an array of p-values for the number of tests made:
+        bonferroni : p * m (family-wise error rate)
+        holm       : step-down Bonferroni, same guarantee but never less powerful
+        bh         : Benjamini-Hochberg, controls the false discovery rate
+        none       : unchanged
+    NaN p-values (tests that could not be made) are left out of the count.
+    """
+    if method not in CORRECTIONS:
+        raise ValueError(f"Unknown correction '{method}', choose from {list(CORRECTIONS)}")
+    pValues = np.asarray(pValues, dtype=np.float64)
+    adjusted = pValues.copy()
+    valid = np.flatnonzero(~np.isnan(pValues))
+    m = valid.size
+    if method == "none" or m == 0:
+        return adjusted
+
+    order = valid[np.argsort(pValues[valid], kind="stable")]
+    ranked = pValues[order]
+    if method == "bonferroni":
+        corrected = ranked * m
+    elif method == "holm":
+        # The i-th smallest p-value is multiplied by (m - i); running max keeps the order
+        corrected = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        # The i-th smallest p-value is multiplied by m / i; running min from the largest down
+        corrected = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    adjusted[order] = np.minimum(corrected, 1.0)
+    return adjusted
+
+
+def _ResolveInput(fileName):
+    # Relative names are looked up in the outputs folder, like in SimulatorComparison
+    filePath = Path(fileName)
+    if not filePath.is_absolute():
+        filePath = Path(__file__).resolve().parent.parent / "outputs" / fileName
+    if not filePath.exists():
+        raise FileNotFoundError(f"Could not find file: {filePath}")
+    return filePath
+
+
+def ReadSelections(filePath, pdgSelections, start=0, end=None):
+    """Four-vectors of every particle selection from one read of a text or PYTHIA .csv file."""
+    if Path(filePath).suffix.lower() == ".csv":
+        return ReadPythiaCsvSelections(filePath, pdgSelections)
+    return ReadSelectionsFourVectors(filePath, pdgSelections, start=start, end=end)
+
+
+def _PairedTStats(ourMatrix, pythiaMatrix):
+    """Paired t statistic and two-sided normal p-value of every column, as in SimulatorComparison."""
+    n = ourMatrix.shape[0]
+    if n < 2:
+        nan = np.full(ourMatrix.shape[1], np.nan)
+        return nan, nan.copy()
+
+    # Observables that are undefined for some events (e.g. eta along the beam) give NaN
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = ourMatrix - pythiaMatrix
+        meanDelta = delta.mean(axis=0)
+        stdDelta = delta.std(axis=0, ddof=1)
+        tStats = meanDelta / (stdDelta / np.sqrt(n))
+
+    # Identical spread-free differences: no bias if the mean is zero, otherwise an infinite one
+    noSpread = np.isclose(stdDelta, 0.0)
+    noBias = noSpread & np.isclose(meanDelta, 0.0)
+    tStats[noSpread] = np.copysign(np.inf, meanDelta[noSpread])
+    tStats[noBias] = 0.0
+
+    return tStats, TwoSidedNormalPvalues(tStats)
+
+
+class BatchComparison:
+    """
+    Compares our generator with PYTHIA for every combination of 'observables'
+    (names from OBSERVABLES) and 'pdgSelections' (PDG codes; None or 0 picks the
+    default particle). Both files are read once; with 'nWorkers' they are parsed
+    in parts in a process pool, like SimulatorComparison.DeserializeFiles.
+    """
+
+    def __init__(self, genOurFile, genPythiaFile, observables=("cosTheta",), pdgSelections=(None,),
+                 correction="holm", nWorkers=None):
+        if correction not in CORRECTIONS:
+            raise ValueError(f"Unknown correction '{correction}', choose from {list(CORRECTIONS)}")
+        self.observables = list(observables)
+        self.pdgSelections = [int(pdg) if pdg else 0 for pdg in pdgSelections]
+        self.correction = correction
+
+        ourP4, pythiaP4 = self.ReadFiles([genOurFile, genPythiaFile], nWorkers)
+        # One structured table of all observables per selection and generator
+        self.ourTables = {pdg: ComputeObservables(p4, self.observables)
+                          for pdg, p4 in zip(self.pdgSelections, ourP4)}
+        self.pythiaTables = {pdg: ComputeObservables(p4, self.observables)
+                             for pdg, p4 in zip(self.pdgSelections, pythiaP4)}
+
+    def ReadFiles(self, fileNames, nWorkers=None):
+        """Reads every file once; returns, per file, one (nEvents, 4) array per selection."""
+        filePaths = [_ResolveInput(fileName) for fileName in fileNames]
+        if nWorkers is None:
+            return [ReadSelections(filePath, self.pdgSelections) for filePath in filePaths]
+
+        nParts = nWorkers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=nParts) as pool:
+            futures = []
+            for filePath in filePaths:
+                if filePath.suffix.lower() == ".csv":
+                    futures.append([pool.submit(ReadSelections, filePath, self.pdgSelections)])
+                else:
+                    futures.append([pool.submit(ReadSelections, filePath, self.pdgSelections, start, end)
+                                    for start, end in SplitAtEvents(filePath, nParts)])
+
+            results = []
+            for fileFutures in futures:
+                parts = [future.result() for future in fileFutures]
+                # Join the parts of every selection back in file order
+                results.append([np.concatenate([part[i] for part in parts] + [np.zeros((0, 4))])
+                                for i in range(len(self.pdgSelections))])
+        return results
+
+    def _Matrix(self, table):
+        """(nEvents, nObservables) float matrix of a structured observable table."""
+        return np.stack([table[name] for name in self.observables], axis=1).astype(np.float64)
+
+    def Run(self):
+        """
+        Runs the paired t-test and the KS test for every (selection, observable)
+        and returns the results table. 'pAdjusted' holds the p-values corrected
+        for all tests in the table; 'sigma' and 'significant' are based on it.
+        """
+        rows = []
+        for pdg in self.pdgSelections:
+            ourMatrix = self._Matrix(self.ourTables[pdg])
+            pythiaMatrix = self._Matrix(self.pythiaTables[pdg])
+            nOur, nPythia = len(ourMatrix), len(pythiaMatrix)
+
+            # Paired t-test: all observables at once; needs the same events from both files
+            if nOur == nPythia:
+                tStats, tPvalues = _PairedTStats(ourMatrix, pythiaMatrix)
+            else:
+                tStats = tPvalues = np.full(len(self.observables), np.nan)
+
+            # KS test: one sort per matrix, one merge per column, all p-values in one call
+            if nOur and nPythia:
+                ourSorted, pythiaSorted = np.sort(ourMatrix, axis=0), np.sort(pythiaMatrix, axis=0)
+                dStats = np.array([KSDistance(ourSorted[:, i], pythiaSorted[:, i])
+                                   for i in range(len(self.observables))])
+                dPvalues = KSPvalues(dStats, nOur, nPythia)
+            else:
+                dStats = dPvalues = np.full(len(self.observables), np.nan)
+
+            for i, name in enumerate(self.observables):
+                rows.append((pdg, name, "t", nOur, nPythia, tStats[i], tPvalues[i]))
+                rows.append((pdg, name, "KS", nOur, nPythia, dStats[i], dPvalues[i]))
+
+        table = np.zeros(len(rows), dtype=RESULT_DTYPE)
+        for field, column in zip(("pdg", "observable", "test", "nOur", "nPythia", "stat", "pVal"), zip(*rows)):
+            table[field] = column
+        table["pAdjusted"] = AdjustPvalues(table["pVal"], self.correction)
+        significance = [InterpretSignificance(pVal) for pVal in table["pAdjusted"]]
+        table["sigma"] = [sigma for sigma, _, _ in significance]
+        table["significant"] = [significant for _, _, significant in significance]
+        return table
+
+    def PrintTable(self, table):
+        """Formats the results table for the console, one line per test."""
+        print("=" * 86)
+        print(f"{'PDG':>6} {'observable':<12} {'test':<4} {'events':>9} {'statistic':>11} "
+              f"{'p-value':>10} {'p-adjusted':>10} {'sigma':>6}  result")
+        print("-" * 86)
+        for row in table:
+            events = f"{row['nOur']}" if row["nOur"] == row["nPythia"] else f"{row['nOur']}/{row['nPythia']}"
+            if np.isnan(row["pVal"]):
+                verdict = "not tested"
+            else:
+                verdict = "DIFFERENT" if row["significant"] else "consistent"
+            print(f"{row['pdg'] or 'auto':>6} {row['observable']:<12} {row['test']:<4} {events:>9} "
+                  f"{row['stat']:>11.4f} {row['pVal']:>10.3e} {row['pAdjusted']:>10.3e} "
+                  f"{row['sigma']:>6.2f}  {verdict}")
+        print("-" * 86)
+        print(f"{len(table)} tests, correction: {self.correction}; "
+              f"{int(np.count_nonzero(table['significant']))} significant")
@@ -0,0 +1,234 @@
+import math
+import numpy as np
+from KolmogorovSmirnov import KolmogorovPvalue
+
+"""
+Fixed-binning histograms and two-sample tests that work on histograms alone.
+A Histogram only keeps, per bin, the sum of the weights and the sum of the
+squared weights, so it can be filled block by block from files of any size
+and histograms of several runs can simply be added together. The tests below
+(chi-square, likelihood ratio, binned Kolmogorov-Smirnov) then compare two
+generators in O(bins) memory, however many events went in.
+"""
+
+
+class Histogram:
+    """
+    A 1D histogram with fixed bin edges.
+    sumW[i] and sumW2[i] hold the sum of weights and of squared weights in bin i.
+    Index 0 is the underflow and index -1 the overflow bin, so no entry is lost;
+    as in np.histogram the last regular bin includes its right edge.
+    """
+
+    def __init__(self, edges):
+        edges = np.asarray(edges, dtype=np.float64)
+        if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError("edges must be a strictly increasing list of at least two values")
+        self.edges = edges
+        self.sumW = np.zeros(edges.size + 1)
+        self.sumW2 = np.zeros(edges.size + 1)
+
+    @classmethod
+    def Uniform(cls, nBins, low, high):
+        """A histogram of 'nBins' equal bins between 'low' and 'high'."""
+        return cls(np.linspace(low, high, nBins + 1))
+
+    @property
+    def NumBins(self):
+        return self.edges.size - 1
+
+    @property
+    def Counts(self):
+        """Sum of weights of the regular bins (without under- and overflow)."""
+        return self.sumW[1:-1]
+
+    @property
+    def Total(self):
+        """Sum of all weights, including under- and overflow."""
+        return float(self.sumW.sum())
+
+    @property
+    def EffectiveEntries(self):
+        """(sum w)^2 / sum w^2: the number of unweighted entries with the same precision."""
+        sumW2 = float(self.sumW2.sum())
+        return self.Total ** 2 / sumW2 if sumW2 > 0 else 0.0
+
+    def BinIndex(self, values):
+        """Bin of every value (0 = underflow, NumBins + 1 = overflow, NaN goes to overflow)."""
+        index = np.searchsorted(self.edges, values, side="right")
+        # Values exactly on the last edge belong to the last regular bin
+        index[values == self.edges[-1]] = self.NumBins
+        return index
+
+    def Fill(self, values, weights=None):
+        """Adds an array of values (optionally with one weight each) to the histogram."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        index = self.BinIndex(values)
+        nSlots = self.sumW.size
+
+        if weights is None:
+            # Unit weights: the sum of squared weights equals the count
+            counts = np.bincount(index, minlength=nSlots)
+            self.sumW += counts
+            self.sumW2 += counts
+        else:
+            weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), values.shape)
+            self.sumW += np.bincount(index, weights=weights, minlength=nSlots)
+            self.sumW2 += np.bincount(index, weights=weights * weights, minlength=nSlots)
+        return self
+
+    def _CheckCompatible(self, other):
+        if not isinstance(other, Histogram):
+            raise TypeError("can only combine a Histogram with another Histogram")
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("histograms must have identical bin edges")
+
+    def __iadd__(self, other):
+        self._CheckCompatible(other)
+        self.sumW += other.sumW
+        self.sumW2 += other.sumW2
+        return self
+
+    def __add__(self, other):
+        return self.Copy().__iadd__(other)
+
+    def Copy(self):
+        histogram = Histogram(self.edges)
+        histogram.sumW = self.sumW.copy()
+        histogram.sumW2 = self.sumW2.copy()
+        return histogram
+
+    def Density(self):
+        """Regular bins normalised to unit area (as np.histogram(density=True))."""
+        total = float(self.Counts.sum())
+        if total == 0:
+            return np.zeros(self.NumBins)
+        return self.Counts / (total * np.diff(self.edges))
+
+    def Save(self, path):
+        """Stores the histogram as a .npz file, e.g. to merge it with later runs."""
+        np.savez(path, edges=self.edges, sumW=self.sumW, sumW2=self.sumW2)
+
+    @classmethod
+    def Load(cls, path):
+        with np.load(path) as data:
+            histogram = cls(data["edges"])
+            histogram.sumW = data["sumW"].copy()
+            histogram.sumW2 = data["sumW2"].copy()
+        return histogram
+
+
+def ChiSquareSurvival(chi2, ndf):
+    """
+    P(X >= chi2) for a chi-square distribution with 'ndf' degrees of freedom,
+    i.e. the regularised upper incomplete gamma function Q(ndf / 2, chi2 / 2).
+    Uses the power series below a + 1 and a continued fraction above it.
+    """
+    if ndf <= 0:
+        return math.nan
+    if chi2 <= 0:
+        return 1.0
+
+    a, x = 0.5 * ndf, 0.5 * chi2
+    logPrefactor = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1.0:
+        # Series for the lower function P(a, x); Q = 1 - P
+        term = total = 1.0 / a
+        n = a
+        for _ in range(10000):
+            n += 1.0
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, min(1.0, 1.0 - total * math.exp(logPrefactor)))
+
+    # Continued fraction for Q(a, x) (modified Lentz method)
+    tiny = 1e-300
+    b = x + 1.0 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return max(0.0, min(1.0, math.exp(logPrefactor) * h))
+
+
+def _UsedBins(first, second):
+    """All bins (with under- and overflow) in which at least one histogram has entries."""
+    first._CheckCompatible(second)
+    return (first.sumW != 0) | (second.sumW != 0)
+
+
+def ChiSquareTest(first, second):
+    """
+    Chi-square test of whether two histograms have the same shape.
+    Each bin compares the normalised contents n1/W1 and n2/W2 with their
+    combined variance (sum w^2 / W^2), so weighted histograms and samples of
+    different size are handled. Returns (chi2, ndf, pVal).
+    """
+    used = _UsedBins(first, second)
+    total1, total2 = first.Total, second.Total
+    if total1 == 0 or total2 == 0:
+        raise ValueError("Both histograms must contain entries for the chi-square test.")
+
+    difference = total2 * first.sumW[used] - total1 * second.sumW[used]
+    variance = total2 ** 2 * first.sumW2[used] + total1 ** 2 * second.sumW2[used]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(variance > 0, difference ** 2 / variance, 0.0)
+
+    chi2 = float(terms.sum())
+    ndf = int(used.sum()) - 1
+    return chi2, ndf, ChiSquareSurvival(chi2, ndf)
+
+
+def LikelihoodRatioTest(first, second):
+    """
+    Likelihood-ratio (G) test of homogeneity for two histograms of counts:
+    G = 2 sum n ln(n / expected), where 'expected' shares every bin out in the
+    ratio of the two totals. Assumes unweighted (Poisson) counts.
+    Returns (G, ndf, pVal); G follows a chi-square distribution with ndf degrees of freedom.
+    """
+    used = _UsedBins(first, second)
+    counts = np.stack((first.sumW[used], second.sumW[used]))
+    totals = counts.sum(axis=1, keepdims=True)
+    if np.any(totals == 0):
+        raise ValueError("Both histograms must contain entries for the likelihood-ratio test.")
+
+    expected = counts.sum(axis=0) * totals / totals.sum()
+    # Empty bins contribute 0 (the limit of n ln n for n -> 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(counts > 0, counts * np.log(counts / expected), 0.0)
+
+    gStat = max(0.0, 2.0 * float(terms.sum()))
+    ndf = int(used.sum()) - 1
+    return gStat, ndf, ChiSquareSurvival(gStat, ndf)
+
+
+def BinnedKSTest(first, second):
+    """
+    Kolmogorov-Smirnov test on binned data: D is the largest gap between the
+    two cumulative histograms at the bin edges. Binning can only hide
+    differences, so D is a lower bound of the unbinned distance. The p-value
+    uses the effective number of entries of each histogram. Returns (D, pVal).
+    """
+    first._CheckCompatible(second)
+    total1, total2 = first.Total, second.Total
+    if total1 == 0 or total2 == 0:
+        raise ValueError("Both histograms must contain entries for the KS test.")
+
+    cdf1 = np.cumsum(first.sumW) / total1
+    cdf2 = np.cumsum(second.sumW) / total2
+    dStat = float(np.max(np.abs(cdf1 - cdf2)))
+    return dStat, KolmogorovPvalue(dStat, first.EffectiveEntries, second.EffectiveEntries)
@@ -0,0 +1,97 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+"""
+Compiled snapshots of the JSON catalogs (particles, processes).
+Building a catalog means parsing the JSON and running every ParticleClass
+setter, including the decay-mode checks. The finished objects are pickled once
+into the cache directory; later runs (and every worker process) load that
+snapshot directly, which skips both steps.
+
+A snapshot is named after the JSON file's path and a SHA-256 of its content
+and of the builder's source code, so editing the JSON or the classes it is
+built into automatically leads to a fresh build; stale snapshots are removed.
+"""
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".catalog_cache"
+PROJECT_DIR = CACHE_DIR.parent
+
+# Source digest per builder function, computed once per process
+_sourceDigests = {}
+
+
+def _SourceDigest(build):
+    """
+    SHA-256 of the file defining 'build' and of every project file it imports
+    from (e.g. ParticleClass), so a code change that alters the pickled objects
+    never loads an old snapshot.
+    """
+    if build not in _sourceDigests:
+        sourceFiles = set()
+        for value in [build, *build.__globals__.values()]:
+            try:
+                sourceFile = Path(inspect.getsourcefile(value)).resolve()
+            except TypeError:
+                # Plain values and built-in objects have no source file
+                continue
+            if PROJECT_DIR in sourceFile.parents and "site-packages" not in sourceFile.parts:
+                sourceFiles.add(sourceFile)
+
+        sha = hashlib.sha256()
+        for sourceFile in sorted(sourceFiles):
+            sha.update(sourceFile.read_bytes())
+        _sourceDigests[build] = sha.digest()
+    return _sourceDigests[build]
+
+
+def LoadCatalog(jsonPath, build, kind):
+    """
+    Returns build(jsonData) for the JSON file at 'jsonPath', taken from the
+    snapshot if one exists for the file's current content. 'kind' names the
+    builder, so different readers of the same file keep separate snapshots.
+    """
+    jsonPath = Path(jsonPath)
+    content = jsonPath.read_bytes()
+    digest = hashlib.sha256(content + _SourceDigest(build)).hexdigest()[:32]
+    # Two JSON files with the same name in different folders must not share a prefix,
+    # otherwise each would delete the other's snapshot below
+    pathDigest = hashlib.sha256(str(jsonPath.resolve()).encode("utf-8")).hexdigest()[:12]
+    prefix = f"{jsonPath.stem}.{pathDigest}.{kind}"
+    snapshotPath = CACHE_DIR / f"{prefix}.{digest}.pickle"
+
+    try:
+        with open(snapshotPath, "rb") as file:
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # No snapshot yet, or a damaged / outdated one: build the catalog again
+        pass
+
+    catalog = build(json.loads(content.decode("utf-8")))
+    _SaveSnapshot(snapshotPath, catalog)
+    # Snapshots of earlier versions of the same file (or code) are of no use any more
+    for oldPath in CACHE_DIR.glob(f"{prefix}.*.pickle"):
+        if oldPath != snapshotPath:
+            oldPath.unlink(missing_ok=True)
+    return catalog
+
+
+def _SaveSnapshot(snapshotPath, catalog):
+    """Writes the snapshot atomically, so parallel workers never read half a file."""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        handle, tempName = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIR)
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(catalog, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempName, snapshotPath)
+        except BaseException:
+            os.unlink(tempName)
+            raise
+    except OSError:
+        # Without a writable cache directory the catalog is simply built every time
+        pass
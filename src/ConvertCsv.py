@@ -1,13 +1,155 @@
 import csv
+import heapq
+import os
+import tempfile
 from pathlib import Path
+import numpy as np
+from EventIndex import EventIndexBuilder
+from EventParser import SelectParticleRows
+from EventStore import ParticleTable, MOTHER_NONE, MOTHER_COLLISION, MOTHER_UNKNOWN
 
 """
-This script converts standardized CSV data from PYTHIA into a custom 
+This script converts standardized CSV data from PYTHIA into a custom
 text-based format used for internal simulation analysis.
+
+The CSV is streamed row by row: PYTHIA writes the particles of one event next
+to each other, so an event is complete as soon as the event number changes and
+can be written out straight away. Memory use therefore does not grow with the
+size of the dump.
 """
 
+# Columns needed to analyse the events without going through the text format
+CSV_COLUMNS = ("event", "id", "isFinal", "mother1", "E", "px", "py", "pz")
+CSV_CHUNK_BYTES = 1 << 24  # Bytes of CSV text parsed per chunk by the array readers
+
+# Number of complete events held back to put slightly out-of-order input in order.
+# Events that arrive even later are sorted on disk and merged in at the end.
+MAX_BUFFERED_EVENTS = 10000
+
+
+def _FormatParticle(eventIdStr, row, columns):
+    """Formats one CSV row as a particle line of the text format."""
+    pdgId = int(row[columns['id']])
+    particleName = row[columns['name']]
+    isFinal = row[columns['isFinal']]
+
+    # Logic to label the "Lifecycle" of the particle:
+    # 'Initial Beam' particles are the ones colliding.
+    # 'Collision' (or Final State) particles are what fly out into the detectors.
+    nameColumn = particleName
+    if isFinal == '0' and row[columns['mother1']] == '0':
+        nameColumn = "Initial Beam"
+    elif isFinal == '1':
+        nameColumn = "Collision"
+
+    # Extract the Four-Momentum: A mathematical vector (E, px, py, pz)
+    # that fully describes the particle's energy and direction.
+    energyVal = float(row[columns['E']])
+    pxVal = float(row[columns['px']])
+    pyVal = float(row[columns['py']])
+    pzVal = float(row[columns['pz']])
+
+    # Write the line with specific padding (e.g., :8.3f) so columns align vertically.
+    # This makes the TXT file human-readable and easy for the 're' (regex) tool to parse.
+    return (f"    {eventIdStr} | {pdgId:>3} | {nameColumn:<12} | "
+            f"(E: {energyVal:8.3f}, px: {pxVal:8.3f}, py: {pyVal:8.3f}, pz: {pzVal:8.3f})\n")
+
+
+def _IterCsvEvents(csvPath):
+    """Yields (eventId, particle lines) for every run of CSV rows with the same event number."""
+    with open(csvPath, mode='r', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        # Look the columns up once instead of building a dictionary per row
+        columns = {name: i for i, name in enumerate(header)}
+        eventColumn = columns['event']
+
+        currentId, lines = None, []
+        for row in reader:
+            if not row:
+                continue
+            eventId = int(row[eventColumn])
+            if eventId != currentId:
+                # A new event number means the previous event is complete
+                if lines:
+                    yield currentId, "".join(lines)
+                currentId, lines = eventId, []
+                # eventIdStr: Formats the ID as 3 digits (e.g., 001 instead of 1)
+                eventIdStr = f"{eventId:03d}"
+            lines.append(_FormatParticle(eventIdStr, row, columns))
+
+        if lines:
+            yield currentId, "".join(lines)
+
 
-def ConvertCsvToTxt(csvFile, txtFile):
+def _IterTxtEvents(txtPath):
+    """Reads back (eventId, particle lines) from a file in the text format."""
+    with open(txtPath, mode='r', newline='\n') as file:
+        eventId, lines = None, []
+        for line in file:
+            if line.startswith("Event"):
+                eventId, lines = int(line.split()[1]), []
+            elif line.strip():
+                lines.append(line)
+            elif eventId is not None:
+                yield eventId, "".join(lines)
+                eventId = None
+
+
+class _EventWriter:
+    """
+    Writes events in the text format. Consecutive pieces of the same event
+    (an event whose rows were split up in the CSV) are joined under one header.
+    """
+
+    def __init__(self, txtPath, withIndex=True):
+        self.txtPath = txtPath
+        self.file = open(txtPath, mode='w', newline='\n')
+        # The size of every event is recorded for the sidecar index (see EventIndex),
+        # so single events can later be read without scanning the file.
+        self.indexBuilder = EventIndexBuilder() if withIndex else None
+        self.currentId, self.lines = None, []
+
+    def Write(self, eventId, particleLines):
+        if eventId != self.currentId:
+            self._Flush()
+            self.currentId = eventId
+        self.lines.append(particleLines)
+
+    def _Flush(self):
+        if self.currentId is None:
+            return
+        # Header line that the SimulatorComparison class uses to split data,
+        # and a newline between events for visual clarity
+        eventText = f"Event {self.currentId}\n" + "".join(self.lines) + "\n"
+        self.file.write(eventText)
+        if self.indexBuilder is not None:
+            self.indexBuilder.Add(self.currentId, len(eventText.encode("utf-8")))
+        self.currentId, self.lines = None, []
+
+    def Close(self):
+        self._Flush()
+        self.file.close()
+        if self.indexBuilder is not None:
+            self.indexBuilder.Save(self.txtPath)
+
+
+def _WriteRun(events, runDir):
+    """Sorts a list of late events and stores it as a temporary run file."""
+    events.sort(key=lambda item: item[:2])
+    handle, runName = tempfile.mkstemp(suffix=".txt", dir=runDir)
+    os.close(handle)
+    runPath = Path(runName)
+    writer = _EventWriter(runPath, withIndex=False)
+    for eventId, _, particleLines in events:
+        writer.Write(eventId, particleLines)
+    writer.Close()
+    return runPath
+
+
+def ConvertCsvToTxt(csvFile, txtFile, maxBufferedEvents=MAX_BUFFERED_EVENTS):
     # Determine the project directory structure to locate input/output folders
     projectRoot = Path(__file__).resolve().parent.parent
     csvPath = projectRoot / "outputs" / csvFile
@@ -17,59 +159,204 @@ def ConvertCsvToTxt(csvFile, txtFile):
         print(f"Error: {csvPath} not found.")
         return
 
-    # A 'Dictionary' to group particles by their specific event ID.
-    # In a collider, one 'Event' is a single collision producing multiple particles.
-    eventsMap = {}
+    with tempfile.TemporaryDirectory(dir=txtPath.parent) as runDir:
+        writer = _EventWriter(txtPath)
 
-    with open(csvPath, mode='r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            eventId = int(row['event'])
-            # If this is a new collision we haven't seen, create a new list for it
-            if eventId not in eventsMap:
-                eventsMap[eventId] = []
-            eventsMap[eventId].append(row)
-
-    # Begin writing the formatted text file
-    with open(txtPath, mode='w') as file:
-        # Sort events numerically to ensure progression is consistent
-        for eventId in sorted(eventsMap.keys()):
-            # Header line that the SimulatorComparison class uses to split data
-            file.write(f"Event {eventId}\n")
-
-            for part in eventsMap[eventId]:
-                # eventIdStr: Formats the ID as 3 digits (e.g., 001 instead of 1)
-                eventIdStr = f"{eventId:03d}"
-                pdgId = int(part['id'])
-                particleName = part['name']
-
-                # Logic to label the "Lifecycle" of the particle:
-                # 'Initial Beam' particles are the ones colliding.
-                # 'Collision' (or Final State) particles are what fly out into the detectors.
-                nameColumn = particleName
-                if part['isFinal'] == '0' and part['mother1'] == '0':
-                    nameColumn = "Initial Beam"
-                elif part['isFinal'] == '1':
-                    nameColumn = "Collision"
-
-                # Extract the Four-Momentum: A mathematical vector (E, px, py, pz)
-                # that fully describes the particle's energy and direction.
-                energyVal = float(part['E'])
-                pxVal = float(part['px'])
-                pyVal = float(part['py'])
-                pzVal = float(part['pz'])
-
-                # Write the line with specific padding (e.g., :8.3f) so columns align vertically.
-                # This makes the TXT file human-readable and easy for the 're' (regex) tool to parse.
-                file.write(f"    {eventIdStr} | {pdgId:>3} | {nameColumn:<12} | "
-                           f"(E: {energyVal:8.3f}, px: {pxVal:8.3f}, py: {pyVal:8.3f}, pz: {pzVal:8.3f})\n")
-
-            # Add a newline between events for visual clarity
-            file.write("\n")
+        # Events wait in a small heap so that neighbours which arrive in the wrong
+        # order are still written sorted. 'order' keeps rows of equal IDs in input order.
+        waiting = []
+        lateEvents, runPaths = [], []
+        lastWritten = None
+
+        for order, (eventId, particleLines) in enumerate(_IterCsvEvents(csvPath)):
+            if lastWritten is not None and eventId < lastWritten:
+                # Its place in the output has already been written: sort it in later
+                lateEvents.append((eventId, order, particleLines))
+                if len(lateEvents) >= maxBufferedEvents:
+                    runPaths.append(_WriteRun(lateEvents, runDir))
+                    lateEvents = []
+                continue
+
+            heapq.heappush(waiting, (eventId, order, particleLines))
+            if len(waiting) > maxBufferedEvents:
+                lastWritten, _, lines = heapq.heappop(waiting)
+                writer.Write(lastWritten, lines)
+
+        while waiting:
+            eventId, _, lines = heapq.heappop(waiting)
+            writer.Write(eventId, lines)
+
+        if lateEvents or runPaths:
+            # External merge: the sorted output so far plus the sorted runs of late
+            # events are combined into the final file, one event at a time.
+            writer.indexBuilder = None
+            writer.Close()
+            mainRun = Path(runDir) / "main.txt"
+            os.replace(txtPath, mainRun)
+            if lateEvents:
+                runPaths.append(_WriteRun(lateEvents, runDir))
+
+            writer = _EventWriter(txtPath)
+            runs = [_IterTxtEvents(path) for path in [mainRun] + runPaths]
+            for eventId, lines in heapq.merge(*runs, key=lambda item: item[0]):
+                writer.Write(eventId, lines)
+        writer.Close()
 
     print(f"Successfully converted {csvPath} to {txtPath}")
 
 
+def _IterCsvChunks(csvPath, chunkBytes=CSV_CHUNK_BYTES, maxBufferedEvents=MAX_BUFFERED_EVENTS):
+    """
+    Reads the analysis columns of a PYTHIA CSV into typed arrays, chunk by chunk.
+    Rows are grouped by event number like ConvertCsvToTxt does: every chunk is
+    sorted by event (stable, so the rows of an event keep their order), which
+    joins split-up events and puts neighbours in order. The rows of the last
+    'maxBufferedEvents' event numbers are kept back and sorted in with the next
+    chunk, so every chunk handed out holds complete events only.
+    Raises ValueError for an event that turns up after it has been handed out;
+    such a file has to go through ConvertCsvToTxt, which merges on disk.
+    """
+    with open(csvPath, mode='r', newline='') as file:
+        header = next(csv.reader([file.readline()]), None)
+        if header is None:
+            return
+        columns = [header.index(name) for name in CSV_COLUMNS]
+
+        carry = None
+        lastYielded = None
+        while True:
+            lines = file.readlines(chunkBytes)
+            if lines:
+                values = np.loadtxt(lines, delimiter=",", usecols=columns, dtype=float, ndmin=2)
+                if carry is not None:
+                    values = np.concatenate((carry, values))
+            elif carry is not None:
+                values, carry = carry, None
+            else:
+                break
+
+            eventColumn = values[:, 0]
+            if np.any(eventColumn[1:] < eventColumn[:-1]):
+                values = values[np.argsort(eventColumn, kind="stable")]
+                eventColumn = values[:, 0]
+            if lastYielded is not None and len(values) and eventColumn[0] <= lastYielded:
+                raise ValueError(
+                    f"{csvPath}: rows of event {int(eventColumn[0])} turn up after that event was "
+                    f"read; convert the file with ConvertCsvToTxt to sort it completely")
+
+            if lines:
+                # Rows of the highest event numbers may still continue in the next chunk
+                eventStarts = _EventStarts(eventColumn)
+                split = eventStarts[-maxBufferedEvents] if len(eventStarts) > maxBufferedEvents else 0
+                values, carry = values[:split], values[split:]
+            if len(values):
+                lastYielded = values[-1, 0]
+                yield {name: values[:, i] for i, name in enumerate(CSV_COLUMNS)}
+
+
+def _EventStarts(eventColumn):
+    """First row of every event in a chunk, whose rows are grouped by event number."""
+    isStart = np.ones(len(eventColumn), dtype=bool)
+    isStart[1:] = eventColumn[1:] != eventColumn[:-1]
+    return np.flatnonzero(isStart)
+
+
+def _ChunkTable(chunk, rows=slice(None)):
+    """Turns the selected rows of a CSV chunk into a ParticleTable."""
+    eventId = chunk["event"][rows].astype(np.int64)
+    isFinal = chunk["isFinal"][rows] == 1
+    isBeam = ~isFinal & (chunk["mother1"][rows] == 0)
+
+    # Same labels as the text conversion: beam particles, final-state particles, the rest
+    mother = np.full(len(eventId), MOTHER_UNKNOWN, dtype=np.int32)
+    mother[isBeam] = MOTHER_NONE
+    mother[isFinal] = MOTHER_COLLISION
+
+    return ParticleTable(
+        eventId=eventId,
+        pdg=chunk["id"][rows].astype(np.int32),
+        mother=mother,
+        e=chunk["E"][rows], px=chunk["px"][rows], py=chunk["py"][rows], pz=chunk["pz"][rows],
+        eventOffsets=np.append(_EventStarts(eventId), len(eventId)).astype(np.int64),
+    )
+
+
+def _CsvPath(csvFile):
+    csvPath = Path(csvFile)
+    if not csvPath.is_absolute():
+        csvPath = Path(__file__).resolve().parent.parent / "outputs" / csvFile
+    if not csvPath.exists():
+        raise FileNotFoundError(f"Could not find file: {csvPath}")
+    return csvPath
+
+
+def ReadPythiaCsv(csvFile, pdg=None, finalOnly=False):
+    """
+    Reads a PYTHIA CSV straight into a ParticleTable, keeping full double precision.
+    With 'pdg' and/or 'finalOnly' only those particles are kept; the filter is
+    applied to every chunk as it is read, so the other rows never pile up.
+    """
+    tables = []
+    for chunk in _IterCsvChunks(_CsvPath(csvFile)):
+        keep = np.ones(len(chunk["event"]), dtype=bool)
+        if pdg is not None:
+            keep &= chunk["id"] == pdg
+        if finalOnly:
+            keep &= chunk["isFinal"] == 1
+        tables.append(_ChunkTable(chunk, keep))
+    return ParticleTable.Concatenate(tables)
+
+
+def IterPythiaCsvSelections(csvFile, pdgSelections, finalOnly=False):
+    """
+    Several particle selections from one pass over the CSV: yields, per chunk,
+    a list with an (nEventsInChunk, 4) array for every entry of 'pdgSelections'.
+    """
+    for chunk in _IterCsvChunks(_CsvPath(csvFile)):
+        eventColumn = chunk["event"]
+        eventStarts = _EventStarts(eventColumn)
+        p4 = np.stack([chunk[name] for name in ("E", "px", "py", "pz")], axis=1)
+
+        selected = []
+        for pdgToFind in pdgSelections:
+            isMatch = None
+            if pdgToFind:
+                isMatch = chunk["id"] == pdgToFind
+                if finalOnly:
+                    isMatch &= chunk["isFinal"] == 1
+            selected.append(p4[SelectParticleRows(eventStarts, len(eventColumn), isMatch)])
+        yield selected
+
+
+def IterPythiaCsvFourVectors(csvFile, pdgToFind=None, finalOnly=False):
+    """
+    Yields the four-vectors of ReadPythiaCsvFourVectors chunk by chunk, as
+    (nEventsInChunk, 4) arrays, so memory use does not grow with the file.
+    """
+    for (p4,) in IterPythiaCsvSelections(csvFile, [pdgToFind], finalOnly):
+        yield p4
+
+
+def ReadPythiaCsvFourVectors(csvFile, pdgToFind=None, finalOnly=False):
+    """
+    Four-vector (E, px, py, pz) of one particle per event, read straight from the CSV.
+    The particle is chosen like SimulatorComparison does for text files: the last
+    one with PDG code 'pdgToFind' (optionally final-state only), or else the
+    second-to-last particle of the event.
+    """
+    selected = list(IterPythiaCsvFourVectors(csvFile, pdgToFind, finalOnly))
+    return np.concatenate(selected) if selected else np.zeros((0, 4))
+
+
+def ReadPythiaCsvSelections(csvFile, pdgSelections, finalOnly=False):
+    """ReadPythiaCsvFourVectors for several selections, reading the CSV once."""
+    selected = [[] for _ in pdgSelections]
+    for chunkSelections in IterPythiaCsvSelections(csvFile, pdgSelections, finalOnly):
+        for chunks, p4 in zip(selected, chunkSelections):
+            chunks.append(p4)
+    return [np.concatenate(chunks) if chunks else np.zeros((0, 4)) for chunks in selected]
+
+
 # Standard Python entry point to run the conversion
 if __name__ == "__main__":
-    ConvertCsvToTxt("mumu_EW.csv", "mumu_EW.txt")
\ No newline at end of file
+    ConvertCsvToTxt("mumu_EW.csv", "mumu_EW.txt")
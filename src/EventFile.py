@@ -0,0 +1,123 @@
+from pathlib import Path
+from Particle import Particle
+from FourVector import FourVector
+from ParticleClass import ParticleClass
+from QedSimulation import Event
+from EventIndex import LoadEventIndex
+from EventParser import PARTICLE_LINE, ReadEventFile
+from ParticleView import EventParticles
+
+
+class EventFile:
+    """
+    Random access to the events of a finished run stored in a text event file.
+    The sidecar index (see EventIndex) gives the byte position of every event,
+    so reading event 999 of a multi-GB file is one seek and one small read.
+
+        with EventFile("OurOutput.txt", registry) as events:
+            lastEvent = events[-1]
+            firstFive = events[:5]
+            event42 = events.GetEvent(42)
+    """
+
+    def __init__(self, fileName, registry):
+        # Relative names are looked up in the 'outputs' directory, like the other readers
+        filePath = Path(fileName)
+        if not filePath.is_absolute() and not filePath.exists():
+            filePath = Path(__file__).resolve().parent.parent / "outputs" / fileName
+        if not filePath.exists():
+            raise FileNotFoundError(f"Could not find file: {filePath}")
+
+        self.filePath = filePath
+        self.registry = registry
+        self.index = LoadEventIndex(filePath)
+        self.file = open(filePath, "rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
+
+    def Close(self):
+        self.file.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, key):
+        """Events by their position in the file: an int gives one Event, a slice a list."""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return [self[row] for row in range(start, stop, step)]
+            return self._ReadRows(start, stop) if stop > start else []
+
+        row = key + len(self) if key < 0 else key
+        if not 0 <= row < len(self):
+            raise IndexError("event index out of range")
+        return self._ReadRows(row, row + 1)[0]
+
+    def EventIds(self):
+        return self.index.eventIds
+
+    def GetEvent(self, eventId):
+        """The event with header 'Event <eventId>'."""
+        row = self.index.Row(eventId)
+        return self._ReadRows(row, row + 1)[0]
+
+    def GetEvents(self, firstId, lastId):
+        """All events from ID firstId up to and including lastId, read in one go."""
+        return self._ReadRows(self.index.Row(firstId), self.index.Row(lastId) + 1)
+
+    def ReadText(self, firstRow, lastRow):
+        """Raw text of the events at rows firstRow:lastRow."""
+        start, end = self.index.ByteRange(firstRow, lastRow)
+        self.file.seek(start)
+        return self.file.read(end - start).decode("utf-8")
+
+    def ReadTable(self, firstRow, lastRow):
+        """The particles of the events at rows firstRow:lastRow as one ParticleTable."""
+        start, end = self.index.ByteRange(firstRow, lastRow)
+        return ReadEventFile(self.filePath, start=start, end=end)
+
+    def ParticleViews(self, firstRow, lastRow):
+        """
+        All particles of the events at rows firstRow:lastRow as ParticleViews:
+        the data stays in the columns of one ParticleTable instead of one
+        Particle and FourVector object per particle.
+        """
+        table = self.ReadTable(firstRow, lastRow)
+        return [view for index in range(table.NumEvents) for view in EventParticles(table, index, self.registry)]
+
+    def _ReadRows(self, firstRow, lastRow):
+        events = []
+        for line in self.ReadText(firstRow, lastRow).splitlines():
+            line = line.strip()
+            if line.startswith("Event"):
+                eventId = int(line.split()[1])
+                events.append(Event(eventId, [], []))
+                continue
+            match = PARTICLE_LINE.match(line)
+            if match and events:
+                self._AddParticle(events[-1], match)
+        return events
+
+    def _AddParticle(self, event, match):
+        pdg = int(match.group(1))
+        name = match.group(2)
+        p4 = FourVector._from_floats(*(float(match.group(i)) for i in range(3, 7)))
+
+        # The file only stores the mother's name, so the mother is kept as that string
+        if name == "Initial Beam":
+            event.initialParticles.append(Particle._from_trusted(self._ParticleType(pdg), p4, eventID=event.id))
+        else:
+            event.finalParticles.append(Particle._from_trusted(self._ParticleType(pdg), p4, mother=name, eventID=event.id))
+
+    def _ParticleType(self, pdg):
+        particleType = self.registry.GetByPdg(pdg)
+        if particleType is None:
+            # Particles missing from the catalog (e.g. PYTHIA's 'system' entry) get a placeholder
+            particleType = ParticleClass(name=f"pdg{pdg}", pdg=pdg, particle_class="unknown",
+                                         mass=0.0, charge=0, stable=True, decay_modes=[])
+        return particleType
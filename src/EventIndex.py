@@ -0,0 +1,106 @@
+import numpy as np
+from pathlib import Path
+from EventParser import ScanEventHeaders
+
+"""
+Sidecar byte-offset index for text event files.
+Next to 'OurOutput.txt' an 'OurOutput.txt.idx.npz' file stores, for every
+event, its ID and the byte offset of its 'Event N' header line. With it a
+reader can seek straight to any event (or range of events) instead of
+scanning the whole file. The index remembers the size and modification time
+of the file it describes and is rebuilt when the file has changed.
+"""
+
+INDEX_SUFFIX = ".idx.npz"
+
+
+def IndexPath(filePath):
+    """Path of the sidecar index belonging to an event file."""
+    return Path(str(filePath) + INDEX_SUFFIX)
+
+
+class EventIndex:
+    """
+    Event IDs and byte offsets of one event file.
+    Event 'row' i (the i-th event in the file) occupies the bytes
+    offsets[i]:offsets[i + 1]; the last offset is the size of the file.
+    """
+
+    def __init__(self, eventIds, offsets):
+        self.eventIds = np.asarray(eventIds, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+        # Generated files number their events 0, 1, 2, ...: the row of an ID is then
+        # a subtraction. Otherwise the IDs are looked up in a sorted copy.
+        nEvents = len(self.eventIds)
+        self.firstId = int(self.eventIds[0]) if nEvents else 0
+        self.isContiguous = bool(np.all(self.eventIds == self.firstId + np.arange(nEvents)))
+        self.sortOrder = None if self.isContiguous else np.argsort(self.eventIds, kind="stable")
+        self.sortedIds = None if self.isContiguous else self.eventIds[self.sortOrder]
+
+    def __len__(self):
+        return len(self.eventIds)
+
+    def Row(self, eventId):
+        """Position of the event with ID 'eventId' in the file."""
+        if self.isContiguous:
+            row = int(eventId) - self.firstId
+            if 0 <= row < len(self):
+                return row
+        else:
+            position = int(np.searchsorted(self.sortedIds, eventId))
+            if position < len(self) and self.sortedIds[position] == eventId:
+                return int(self.sortOrder[position])
+        raise KeyError(f"Event {eventId} is not in the index")
+
+    def ByteRange(self, firstRow, lastRow=None):
+        """Byte offsets (start, end) covering the rows firstRow:lastRow."""
+        lastRow = firstRow + 1 if lastRow is None else lastRow
+        return int(self.offsets[firstRow]), int(self.offsets[lastRow])
+
+    def Save(self, filePath):
+        """Writes the index next to 'filePath', stamped with the file's size and mtime."""
+        stat = Path(filePath).stat()
+        with open(IndexPath(filePath), "wb") as file:
+            np.savez(file, eventIds=self.eventIds, offsets=self.offsets,
+                     fileSize=stat.st_size, fileMtime=stat.st_mtime_ns)
+
+
+class EventIndexBuilder:
+    """
+    Collects the index while an event file is being written, so no extra pass
+    over the file is needed. Add() is called once per event with the number of
+    bytes written for it (header, particle lines and separating blank line).
+    """
+
+    def __init__(self):
+        self.eventIds = []
+        self.offsets = [0]
+
+    def Add(self, eventId, nBytes):
+        self.eventIds.append(eventId)
+        self.offsets.append(self.offsets[-1] + nBytes)
+
+    def Save(self, filePath):
+        index = EventIndex(self.eventIds, self.offsets)
+        index.Save(filePath)
+        return index
+
+
+def BuildEventIndex(filePath):
+    """Scans an existing event file for its headers and saves the index."""
+    eventIds, offsets = ScanEventHeaders(filePath)
+    index = EventIndex(eventIds, np.append(offsets, Path(filePath).stat().st_size))
+    index.Save(filePath)
+    return index
+
+
+def LoadEventIndex(filePath):
+    """Loads the sidecar index of an event file, (re)building it if it is missing or stale."""
+    indexPath = IndexPath(filePath)
+    if indexPath.exists():
+        stat = Path(filePath).stat()
+        with np.load(indexPath) as stored:
+            if int(stored["fileSize"]) == stat.st_size and int(stored["fileMtime"]) == stat.st_mtime_ns:
+                return EventIndex(stored["eventIds"], stored["offsets"])
+    return BuildEventIndex(filePath)
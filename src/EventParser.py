@@ -0,0 +1,516 @@
+import re
+import numpy as np
+from EventStore import ParticleTable, MOTHER_NONE, MOTHER_COLLISION, MOTHER_UNKNOWN
+
+"""
+Fast reader for the text event format written by QedSimulation and ConvertCsv:
+
+    Event 0
+        000 |  13 | Initial Beam | (E:   45.590, px:    0.000, py:    0.000, pz:   45.590)
+
+Instead of splitting and regex-matching every line in Python, the file is read
+in large blocks and each block is scanned as a NumPy byte array: line breaks and
+'|' separators are located with vectorized comparisons, and the numeric fields
+are decoded column by column for all lines at once.
+"""
+
+# Bytes read per block (2 MB). Small enough that the per-line arrays of a block
+# stay in the CPU cache, which makes the scan several times faster than large blocks.
+BLOCK_SIZE = 1 << 21
+
+NEWLINE = ord("\n")
+BAR = ord("|")
+SPACE = ord(" ")
+
+# Fallbacks for blocks or lines that do not follow the expected layout
+PARTICLE_LINE = re.compile(
+    r"^\s*\d+\s*\|\s*([-+]?\d+)\s*\|\s*(.*?)\s*\|\s*\(E:\s*(\S+),\s*px:\s*(\S+),\s*py:\s*(\S+),\s*pz:\s*([^)\s]+)\)"
+)
+TAIL_NUMBER = re.compile(r"(?:E|px|py|pz):\s*([^,)\s]+)")
+
+
+def _IterBlocks(filePath, blockSize, start=0, end=None):
+    """
+    Yields byte blocks that always end right before an 'Event' header line.
+    'start' and 'end' limit the reading to one part of the file (see SplitAtEvents).
+    """
+    with open(filePath, "rb") as file:
+        if end is None:
+            end = file.seek(0, 2)
+        position = start
+        while True:
+            file.seek(position)
+            data = file.read(min(blockSize, end - position))
+            if position + len(data) >= end:
+                # Last block of the part
+                if data:
+                    yield data if data.endswith(b"\n") else data + b"\n"
+                break
+
+            cut = data.rfind(b"\nEvent")
+            if cut < 0:
+                # A single event is larger than the block: read more at once
+                blockSize *= 2
+                continue
+            # The incomplete event at the end is read again as part of the next block
+            position += cut + 1
+            yield memoryview(data)[:cut + 1]
+
+
+def ParseNumbers(buf, starts, ends):
+    """
+    Vectorized decimal parser: converts the text buf[starts[i]:ends[i]] of every
+    field into a float. Fields may contain spaces, a sign, digits and a decimal point.
+    The digits are collected into an integer mantissa and divided by a power of
+    ten once, which gives the same (correctly rounded) value as float().
+    Returns None if any field contains other characters (e.g. exponents).
+    """
+    if len(starts) == 0:
+        return np.zeros(0)
+
+    # One column per character position; the transposed copy keeps columns contiguous
+    window = np.ascontiguousarray(_RightAlignedWindow(buf, starts, ends).T)
+    digits = window - np.uint8(48)
+    isDigit = digits < 10
+    isDot = window == 46
+    isMinus = window == 45
+    if not np.all(isDigit | isDot | isMinus | (window == SPACE) | (window == 43)):
+        return None
+
+    # Walk over the character columns, adding digits to the mantissa and counting
+    # the digits after the decimal point
+    mantissa = np.zeros(len(starts), dtype=np.int64)
+    decimals = np.zeros(len(starts), dtype=np.int64)
+    afterDot = np.zeros(len(starts), dtype=bool)
+    for column in range(window.shape[0]):
+        mantissa = np.where(isDigit[column], mantissa * 10 + digits[column], mantissa)
+        afterDot |= isDot[column]
+        decimals += isDigit[column] & afterDot
+
+    values = mantissa / 10.0 ** decimals
+    return np.where(np.any(isMinus, axis=0), -values, values)
+
+
+class _Block:
+    """
+    Layout of one block of the event file: where its header and particle lines are.
+    The PDG codes, mother columns, event IDs and four-vectors are only decoded
+    when they are asked for, so a selection pass skips most of the text.
+    """
+
+    def __init__(self, buf, headerStarts, headerEnds, headerRows, bars, lineEnds):
+        self.buf = buf
+        self.headerStarts = headerStarts
+        self.headerEnds = headerEnds
+        # Index of the first particle line after every header
+        self.headerRows = headerRows
+        # The positions of the first, second and third '|' of every particle line
+        self.bars = bars
+        self.lineEnds = lineEnds
+        # Decoded columns, filled on first use (or directly by the fallback parser)
+        self.pdg = None
+        self.mother = None
+        self.eventIds = None
+        self.p4 = None
+
+    @property
+    def NumParticles(self):
+        return len(self.lineEnds)
+
+    def EventStarts(self):
+        """
+        First particle row of every non-empty event in the block, and the position
+        of its header in EventIds(). Particle lines before the first header form
+        their own event (ID -1).
+        """
+        bounds = np.concatenate(([0], self.headerRows, [self.NumParticles])).astype(np.int64)
+        nonEmpty = np.flatnonzero(bounds[1:] > bounds[:-1])
+        return bounds[nonEmpty], nonEmpty
+
+    def Pdg(self):
+        if self.pdg is None:
+            pdg = ParseNumbers(self.buf, self.bars[0] + 1, self.bars[1])
+            if pdg is None:
+                raise ValueError("Could not parse the PDG column of the event file.")
+            self.pdg = pdg.astype(np.int64)
+        return self.pdg
+
+    def MatchPdg(self, pdgToFind):
+        """Boolean mask of the particle lines whose PDG column reads 'pdgToFind'."""
+        if self.pdg is not None:
+            return self.pdg == pdgToFind
+
+        # Compare the text of the column directly instead of decoding every number
+        buf = self.buf
+        target = str(int(pdgToFind)).encode()
+        widths = self.bars[1] - self.bars[0] - 1
+        width = int(widths[0]) if widths.size else 0
+        if widths.size and width >= len(target) and np.all(widths == width):
+            # Aligned column: each field is one fixed-size string, compare it with
+            # every way the number can be padded to that width
+            fields = np.lib.stride_tricks.sliding_window_view(buf, width)[self.bars[0] + 1]
+            fields = fields.view(f"S{width}").ravel()
+            isMatch = np.zeros(len(fields), dtype=bool)
+            for left in range(width - len(target) + 1):
+                padded = b" " * left + target + b" " * (width - len(target) - left)
+                isMatch |= fields == padded
+            return isMatch
+
+        # Walk back from the closing '|' over the padding, then check the digits one by one
+        position = self.bars[1] - 1
+        for _ in range(position.size and int(np.max(position - self.bars[0]))):
+            isPadding = (buf[position] == SPACE) & (position > self.bars[0])
+            if not np.any(isPadding):
+                break
+            position = position - isPadding
+
+        isMatch = np.ones(len(position), dtype=bool)
+        for character in reversed(target):
+            isMatch &= (buf[position] == character) & (position > self.bars[0])
+            position = position - 1
+        # The number must not continue further to the left
+        before = buf[position]
+        return isMatch & ((before == SPACE) | (position == self.bars[0]))
+
+    def Mother(self):
+        """Mother column: "Initial Beam", "Collision" or a particle name (mother unknown)."""
+        if self.mother is None:
+            nameStarts = np.minimum(self.bars[1] + 2, len(self.buf) - 12)
+            nameWindow = np.lib.stride_tricks.sliding_window_view(self.buf, 12)[nameStarts]
+            mother = np.full(self.NumParticles, MOTHER_UNKNOWN, dtype=np.int32)
+            mother[np.all(nameWindow == np.frombuffer(b"Initial Beam", dtype=np.uint8), axis=1)] = MOTHER_NONE
+            mother[np.all(nameWindow == np.frombuffer(b"Collision   ", dtype=np.uint8), axis=1)] = MOTHER_COLLISION
+            self.mother = mother
+        return self.mother
+
+    def EventIds(self):
+        """IDs from the 'Event N' headers, preceded by -1 for lines before the first header."""
+        if self.eventIds is None:
+            headerIds = ParseNumbers(self.buf, self.headerStarts + 5, self.headerEnds)
+            if headerIds is None:
+                raise ValueError("Could not parse the event headers of the event file.")
+            self.eventIds = np.concatenate(([-1], headerIds)).astype(np.int64)
+        return self.eventIds
+
+    def FourVectors(self, rows):
+        """Decodes (E, px, py, pz) of the selected particle lines into an (N, 4) array."""
+        if self.p4 is not None:
+            return self.p4[rows]
+
+        tailStarts, tailEnds = self.bars[2][rows] + 1, self.lineEnds[rows]
+        p4 = _ParseTails(self.buf, tailStarts, tailEnds)
+        if p4 is None:
+            # Unusual number formatting somewhere in these lines
+            p4 = _ParseTailsSlow(self.buf, tailStarts, tailEnds)
+        return p4
+
+
+def _RightAlignedWindow(buf, starts, ends):
+    """Copies the fields buf[starts[i]:ends[i]] into the rows of a space-padded byte matrix."""
+    lengths = ends - starts
+    width = max(int(np.max(lengths)), 1) if len(starts) else 1
+    firsts = ends - width
+
+    if len(buf) >= width and (len(firsts) == 0 or firsts.min() >= 0):
+        # Rows of a sliding-window view are copied as whole slices, without an index per byte
+        window = np.lib.stride_tricks.sliding_window_view(buf, width)[firsts]
+    else:
+        window = buf[np.maximum(firsts[:, None] + np.arange(width), 0)]
+
+    if len(starts) and lengths.min() != width:
+        window[np.arange(width) < (width - lengths)[:, None]] = SPACE
+    return window
+
+
+def _ParseTails(buf, tailStarts, tailEnds):
+    """
+    Decodes the '(E: ..., px: ..., py: ..., pz: ...)' part of each selected line.
+    The tails are copied into one byte matrix in which the ':' before and the
+    ',' or ')' after every number are located with vectorized comparisons;
+    ParseNumbers then decodes all four columns of numbers at once.
+    Returns None if the lines do not hold exactly four plain numbers.
+    """
+    nRows = len(tailStarts)
+    if nRows == 0:
+        return np.zeros((0, 4))
+
+    tails = _RightAlignedWindow(buf, tailStarts, tailEnds)
+    width = tails.shape[1]
+    colons = np.flatnonzero(tails == ord(":"))
+    ends = np.flatnonzero((tails == ord(",")) | (tails == ord(")")))
+    if colons.size != 4 * nRows or ends.size != 4 * nRows:
+        return None
+    rows = colons // width
+    if np.any(ends // width != rows) or np.any(colons >= ends):
+        return None
+
+    # Matrix positions back to positions in the block (the rows are right-aligned at the line end)
+    shift = np.repeat(tailEnds - width * np.arange(1, nRows + 1), 4)
+    values = ParseNumbers(buf, colons + shift + 1, ends + shift)
+    return None if values is None else values.reshape(nRows, 4)
+
+
+def _ParseTailsSlow(buf, tailStarts, tailEnds):
+    """Python version of _ParseTails for number formats the vectorized path rejects."""
+    p4 = []
+    for start, end in zip(tailStarts.tolist(), tailEnds.tolist()):
+        numbers = TAIL_NUMBER.findall(bytes(buf[start:end]).decode("utf-8"))
+        if len(numbers) != 4:
+            raise ValueError(f"Could not parse momentum from: {bytes(buf[start:end])!r}")
+        p4.append([float(number) for number in numbers])
+    return np.array(p4, dtype=float).reshape(-1, 4)
+
+
+def _ScanBlock(data):
+    """Vectorized scan of one block. Returns None if the layout is not the expected one."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+
+    newlines = np.flatnonzero(buf == NEWLINE)
+    lineStarts = np.empty_like(newlines)
+    lineStarts[:1] = 0
+    lineStarts[1:] = newlines[:-1] + 1
+
+    # The first character tells the lines apart: '\n' (empty line), 'E' (header) or a particle line
+    firstCharacters = buf[lineStarts]
+    headerLines = np.flatnonzero(firstCharacters == ord("E"))
+    particleLines = np.flatnonzero((firstCharacters != NEWLINE) & (firstCharacters != ord("E")))
+    headerStarts, headerEnds = lineStarts[headerLines], newlines[headerLines]
+    starts, ends = lineStarts[particleLines], newlines[particleLines]
+    if np.any(headerEnds - headerStarts < 5):
+        return None
+    headerWords = np.lib.stride_tricks.sliding_window_view(buf, 5)[headerStarts]
+    if np.any(headerWords.view("S5").ravel() != b"Event"):
+        return None
+
+    bars = _FindBars(data, buf, starts, ends)
+    if bars is None:
+        return None
+    headerRows = np.searchsorted(starts, headerStarts)
+    return _Block(buf, headerStarts, headerEnds, headerRows, bars, ends)
+
+
+def _FindBars(data, buf, starts, ends):
+    """
+    Positions of the three '|' separators of every particle line, one array per separator.
+    The columns are padded to a fixed width, so the offsets found in the first line
+    are tried for all lines; only if that fails is the whole block searched.
+    """
+    if starts.size == 0:
+        return (np.zeros(0, dtype=np.int64),) * 3
+
+    firstLine = bytes(data[starts[0]:ends[0]])
+    offsets = [i for i, character in enumerate(firstLine) if character == BAR]
+    if len(offsets) == 3:
+        # The columns right of the index are padded to fixed widths, so counting from the
+        # line end still works once the event index grows by a digit; then try from the start
+        lineLength = len(firstLine)
+        lengths = ends - starts
+        if np.all(lengths > lineLength - offsets[0]):
+            bars = tuple(ends - (lineLength - offset) for offset in offsets)
+            if all(np.all(buf[column] == BAR) for column in bars):
+                return bars
+        if np.all(lengths > offsets[2]):
+            bars = tuple(starts + offset for offset in offsets)
+            if all(np.all(buf[column] == BAR) for column in bars):
+                return bars
+
+    # Columns are not aligned: every particle line has exactly three '|' separators
+    bars = np.flatnonzero(buf == BAR)
+    if bars.size != 3 * starts.size:
+        return None
+    bars = bars.reshape(-1, 3)
+    if np.any(bars[:, 0] <= starts) or np.any(bars[:, 2] >= ends):
+        return None
+    return tuple(np.ascontiguousarray(bars.T))
+
+
+def _ParseBlockSlow(data):
+    """Line-by-line regex parser, used when a block does not match the fast layout."""
+    eventIds = [-1]
+    headerRows, pdg, mother, p4 = [], [], [], []
+
+    for line in data.decode("utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("Event"):
+            eventIds.append(int(line.split()[1]))
+            headerRows.append(len(pdg))
+            continue
+        match = PARTICLE_LINE.match(line)
+        if not match:
+            continue
+
+        name = match.group(2)
+        pdg.append(int(match.group(1)))
+        if name == "Initial Beam":
+            mother.append(MOTHER_NONE)
+        elif name == "Collision":
+            mother.append(MOTHER_COLLISION)
+        else:
+            mother.append(MOTHER_UNKNOWN)
+        p4.append([float(match.group(i)) for i in range(3, 7)])
+
+    block = _Block(None, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                   np.array(headerRows, dtype=np.int64),
+                   (np.zeros(len(pdg), dtype=np.int64),) * 3, np.zeros(len(pdg), dtype=np.int64))
+    block.pdg = np.array(pdg, dtype=np.int64)
+    block.mother = np.array(mother, dtype=np.int32)
+    block.eventIds = np.array(eventIds, dtype=np.int64)
+    block.p4 = np.array(p4, dtype=float).reshape(-1, 4)
+    return block
+
+
+def _IterParsedBlocks(filePath, blockSize, start=0, end=None):
+    for data in _IterBlocks(filePath, blockSize, start, end):
+        block = _ScanBlock(data)
+        yield block if block is not None else _ParseBlockSlow(data)
+
+
+def SelectParticleRows(eventStarts, nRows, isMatch=None):
+    """
+    Picks one particle per event, following SimulatorComparison.ExtractObservable:
+    the last particle flagged in 'isMatch' (lines with the wanted PDG code),
+    or else the second-to-last particle of the event.
+    """
+    eventEnds = np.concatenate((eventStarts[1:], [nRows])).astype(np.int64)
+    rows = eventEnds - 2
+
+    matches = np.flatnonzero(isMatch) if isMatch is not None else np.zeros(0, dtype=np.int64)
+    if matches.size:
+        eventOfMatch = np.searchsorted(eventStarts, matches, side="right") - 1
+        # Keep only the last match of each event
+        isLast = np.concatenate((eventOfMatch[1:] != eventOfMatch[:-1], [True]))
+        rows[eventOfMatch[isLast]] = matches[isLast]
+
+    if np.any(rows < eventStarts):
+        raise ValueError("Found an event with fewer than two particle lines and no matching PDG code.")
+    return rows
+
+
+def SplitAtEvents(filePath, nParts):
+    """
+    Cuts a file into about 'nParts' byte ranges (start, end) of similar size.
+    Every cut is placed right before an 'Event' header line, so each part
+    holds complete events and can be parsed on its own.
+    """
+    with open(filePath, "rb") as file:
+        fileSize = file.seek(0, 2)
+        cuts = [0]
+        for i in range(1, nParts):
+            position = max(fileSize * i // nParts, cuts[-1])
+            # Look for the next header after the rough cut position
+            while position < fileSize:
+                file.seek(position)
+                data = file.read(1 << 16)
+                found = data.find(b"\nEvent")
+                if found >= 0:
+                    position += found + 1
+                    break
+                position += max(len(data) - 6, 1)
+            if cuts[-1] < position < fileSize:
+                cuts.append(position)
+    cuts.append(fileSize)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def IterSelectionsFourVectors(filePath, pdgSelections, blockSize=BLOCK_SIZE, start=0, end=None):
+    """
+    Like IterSelectedFourVectors, but for several particle selections from a
+    single pass over the file: yields one list per block with an
+    (nEventsInBlock, 4) array for every entry of 'pdgSelections'.
+    """
+    for block in _IterParsedBlocks(filePath, blockSize, start, end):
+        eventStarts, _ = block.EventStarts()
+        if eventStarts.size == 0:
+            continue
+        if sum(1 for pdgToFind in pdgSelections if pdgToFind) > 1:
+            # Decoding the PDG column once is cheaper than one text match per selection
+            block.Pdg()
+        selected = []
+        for pdgToFind in pdgSelections:
+            isMatch = block.MatchPdg(pdgToFind) if pdgToFind else None
+            selected.append(block.FourVectors(SelectParticleRows(eventStarts, block.NumParticles, isMatch)))
+        yield selected
+
+
+def IterSelectedFourVectors(filePath, pdgToFind=None, blockSize=BLOCK_SIZE, start=0, end=None):
+    """
+    Yields the four-vectors of the selected particle per event (see
+    ReadSelectedFourVectors) block by block, as (nEventsInBlock, 4) arrays.
+    Memory use stays at one block however large the file is.
+    """
+    for (p4,) in IterSelectionsFourVectors(filePath, [pdgToFind], blockSize, start, end):
+        yield p4
+
+
+def ReadSelectedFourVectors(filePath, pdgToFind=None, blockSize=BLOCK_SIZE, start=0, end=None):
+    """
+    Reads an event file and returns the four-vector (E, px, py, pz) of one selected
+    particle per event (see SelectParticleRows) as an (nEvents, 4) array.
+    Only the selected lines have their numbers decoded.
+    'start' and 'end' restrict the reading to a byte range from SplitAtEvents.
+    """
+    chunks = list(IterSelectedFourVectors(filePath, pdgToFind, blockSize, start, end))
+    return np.concatenate(chunks) if chunks else np.zeros((0, 4))
+
+
+def ReadSelectionsFourVectors(filePath, pdgSelections, blockSize=BLOCK_SIZE, start=0, end=None):
+    """
+    ReadSelectedFourVectors for several particle selections at once: the file
+    is read a single time. Returns one (nEvents, 4) array per entry of 'pdgSelections'.
+    """
+    selected = [[] for _ in pdgSelections]
+    for blockSelections in IterSelectionsFourVectors(filePath, pdgSelections, blockSize, start, end):
+        for chunks, p4 in zip(selected, blockSelections):
+            chunks.append(p4)
+    return [np.concatenate(chunks) if chunks else np.zeros((0, 4)) for chunks in selected]
+
+
+def ReadEventFile(filePath, blockSize=BLOCK_SIZE, start=0, end=None):
+    """
+    Reads every particle of an event file into a ParticleTable.
+    'start' and 'end' restrict the reading to a byte range (e.g. from an EventIndex).
+    """
+    tables = []
+    for block in _IterParsedBlocks(filePath, blockSize, start, end):
+        nRows = block.NumParticles
+        p4 = block.FourVectors(np.arange(nRows))
+        eventStarts, eventHeaders = block.EventStarts()
+        eventOffsets = np.concatenate((eventStarts, [nRows])).astype(np.int64)
+
+        tables.append(ParticleTable(
+            eventId=np.repeat(block.EventIds()[eventHeaders], np.diff(eventOffsets)),
+            pdg=block.Pdg().astype(np.int32),
+            mother=block.Mother(),
+            e=p4[:, 0], px=p4[:, 1], py=p4[:, 2], pz=p4[:, 3],
+            eventOffsets=eventOffsets,
+        ))
+
+    return ParticleTable.Concatenate(tables)
+
+
+def ScanEventHeaders(filePath, blockSize=BLOCK_SIZE):
+    """
+    Finds every 'Event N' header line of a file without decoding the particles.
+    Returns the event IDs and the byte offsets where their header lines start.
+    """
+    eventIds, offsets = [], []
+    position = 0
+    for data in _IterBlocks(filePath, blockSize):
+        buf = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(buf == NEWLINE)
+        lineStarts = np.concatenate(([0], newlines[:-1] + 1))
+        lineStarts = lineStarts[lineStarts < newlines]
+
+        headerStarts = lineStarts[buf[lineStarts] == ord("E")]
+        headerEnds = newlines[np.searchsorted(newlines, headerStarts)]
+        headerIds = ParseNumbers(buf, headerStarts + 5, headerEnds)
+        if headerIds is None:
+            raise ValueError(f"Could not parse the event headers of {filePath}")
+
+        eventIds.append(headerIds.astype(np.int64))
+        offsets.append(headerStarts + position)
+        position += len(buf)
+
+    if not eventIds:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(eventIds), np.concatenate(offsets).astype(np.int64)
@@ -0,0 +1,205 @@
+import numpy as np
+from pathlib import Path
+
+"""
+Columnar binary storage for generated events.
+Instead of one padded text line per particle, every particle property is kept
+in its own NumPy array (.npy file) inside an event-store directory:
+
+    eventId.npy, pdg.npy, mother.npy, e.npy, px.npy, py.npy, pz.npy
+    eventOffsets.npy  -> particles of event i are rows eventOffsets[i]:eventOffsets[i+1]
+
+The reader opens the arrays memory-mapped, so millions of events can be
+analysed without any text formatting or parsing.
+"""
+
+# Special values of the 'mother' column (otherwise: row of the mother inside its event)
+MOTHER_NONE = -1       # Initial beam particle, no mother
+MOTHER_COLLISION = -2  # Produced by the hard collision itself
+MOTHER_UNKNOWN = -3    # Has a mother, but the file does not say which particle
+
+COLUMN_TYPES = {
+    "eventId": np.int64,
+    "pdg": np.int32,
+    "mother": np.int32,
+    "e": np.float64,
+    "px": np.float64,
+    "py": np.float64,
+    "pz": np.float64,
+}
+
+
+class ParticleTable:
+    """
+    Per-particle columns of a set of events plus an event-offset index.
+    Used as the common in-memory form of event files in the analysis code.
+    """
+
+    def __init__(self, eventId, pdg, mother, e, px, py, pz, eventOffsets):
+        self.eventId = eventId
+        self.pdg = pdg
+        self.mother = mother
+        self.e = e
+        self.px = px
+        self.py = py
+        self.pz = pz
+        # eventOffsets has one entry more than there are events
+        self.eventOffsets = eventOffsets
+
+    @property
+    def NumEvents(self):
+        return len(self.eventOffsets) - 1
+
+    @property
+    def NumParticles(self):
+        return len(self.pdg)
+
+    def __len__(self):
+        return self.NumEvents
+
+    def Column(self, name):
+        return getattr(self, name)
+
+    def EventSlice(self, index):
+        """Rows of the particles belonging to the event at position 'index'."""
+        return slice(int(self.eventOffsets[index]), int(self.eventOffsets[index + 1]))
+
+    def P4(self, rows=slice(None)):
+        """Four-momenta (E, px, py, pz) of the selected rows as an (N, 4) array."""
+        return np.stack((self.e[rows], self.px[rows], self.py[rows], self.pz[rows]), axis=1)
+
+    @classmethod
+    def Empty(cls):
+        """A table without any events."""
+        columns = {name: np.zeros(0, dtype=dtype) for name, dtype in COLUMN_TYPES.items()}
+        return cls(eventOffsets=np.zeros(1, dtype=np.int64), **columns)
+
+    @classmethod
+    def Concatenate(cls, tables):
+        """Joins several tables, shifting the event offsets accordingly."""
+        tables = list(tables)
+        if not tables:
+            return cls.Empty()
+        columns = {name: np.concatenate([t.Column(name) for t in tables]) for name in COLUMN_TYPES}
+
+        offsets = [np.zeros(1, dtype=np.int64)]
+        shift = 0
+        for table in tables:
+            offsets.append(np.asarray(table.eventOffsets[1:], dtype=np.int64) + shift)
+            shift += table.NumParticles
+        return cls(eventOffsets=np.concatenate(offsets), **columns)
+
+
+def TableFromBatch(batch):
+    """Converts a QedSimulation.EventBatch into a ParticleTable without building objects."""
+    nEvents = len(batch)
+    nSlots = len(batch.particleTypes)
+
+    motherCodes = [MOTHER_NONE if mother is None else MOTHER_COLLISION for mother in batch.mothers]
+    flatP4 = batch.p4.reshape(nEvents * nSlots, 4)
+
+    return ParticleTable(
+        eventId=np.repeat(batch.eventIds, nSlots),
+        pdg=np.tile(np.array([t.pdg for t in batch.particleTypes], dtype=np.int32), nEvents),
+        mother=np.tile(np.array(motherCodes, dtype=np.int32), nEvents),
+        e=flatP4[:, 0].copy(),
+        px=flatP4[:, 1].copy(),
+        py=flatP4[:, 2].copy(),
+        pz=flatP4[:, 3].copy(),
+        eventOffsets=np.arange(nEvents + 1, dtype=np.int64) * nSlots,
+    )
+
+
+def TableFromEvents(events):
+    """Converts a list of Event objects (per-event generation path) into a ParticleTable."""
+    rows = {name: [] for name in COLUMN_TYPES}
+    offsets = [0]
+
+    for event in events:
+        particles = event.initialParticles + event.finalParticles
+        for particle in particles:
+            if particle.mother is None:
+                mother = MOTHER_NONE
+            elif isinstance(particle.mother, str):
+                mother = MOTHER_COLLISION
+            else:
+                mother = particles.index(particle.mother)
+
+            rows["eventId"].append(event.id)
+            rows["pdg"].append(particle.pdg)
+            rows["mother"].append(mother)
+            rows["e"].append(particle.p4.e)
+            rows["px"].append(particle.p4.px)
+            rows["py"].append(particle.p4.py)
+            rows["pz"].append(particle.p4.pz)
+        offsets.append(offsets[-1] + len(particles))
+
+    columns = {name: np.array(values, dtype=COLUMN_TYPES[name]) for name, values in rows.items()}
+    return ParticleTable(eventOffsets=np.array(offsets, dtype=np.int64), **columns)
+
+
+class EventStoreWriter:
+    """
+    Writes ParticleTable chunks into an event-store directory.
+    Chunks are appended to raw column files as they arrive (so streaming runs
+    never hold the full sample); Close() turns them into .npy arrays.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rawFiles = {name: open(self.directory / f"{name}.bin", "wb") for name in COLUMN_TYPES}
+        self.eventOffsets = [np.zeros(1, dtype=np.int64)]
+        self.nParticles = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.Close()
+
+    def Append(self, table):
+        for name, dtype in COLUMN_TYPES.items():
+            self.rawFiles[name].write(np.ascontiguousarray(table.Column(name), dtype=dtype).tobytes())
+        self.eventOffsets.append(np.asarray(table.eventOffsets[1:], dtype=np.int64) + self.nParticles)
+        self.nParticles += table.NumParticles
+
+    def Close(self):
+        if self.rawFiles is None:
+            return
+
+        blockRows = 1 << 20
+        for name, dtype in COLUMN_TYPES.items():
+            rawFile = self.rawFiles[name]
+            rawFile.close()
+            rawPath = Path(rawFile.name)
+
+            # Copy the raw bytes into a proper .npy file, one block at a time
+            raw = np.memmap(rawPath, dtype=dtype, mode="r") if self.nParticles else np.empty(0, dtype)
+            target = np.lib.format.open_memmap(self.directory / f"{name}.npy", mode="w+",
+                                               dtype=dtype, shape=(self.nParticles,))
+            for start in range(0, self.nParticles, blockRows):
+                target[start:start + blockRows] = raw[start:start + blockRows]
+            target.flush()
+            del raw, target
+            rawPath.unlink()
+
+        np.save(self.directory / "eventOffsets.npy", np.concatenate(self.eventOffsets))
+        self.rawFiles = None
+
+
+def WriteEventStore(directory, table):
+    """Writes a complete ParticleTable as an event store."""
+    with EventStoreWriter(directory) as writer:
+        writer.Append(table)
+
+
+def OpenEventStore(directory):
+    """Opens an event store memory-mapped and returns it as a ParticleTable."""
+    directory = Path(directory)
+    if not (directory / "eventOffsets.npy").exists():
+        raise FileNotFoundError(f"No event store found at: {directory}")
+
+    columns = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMN_TYPES}
+    eventOffsets = np.load(directory / "eventOffsets.npy", mmap_mode="r")
+    return ParticleTable(eventOffsets=eventOffsets, **columns)
@@ -11,12 +11,29 @@ class FourVector:
 
     metric = (1, -1, -1, -1)
 
+    # Fixed attribute slots instead of a per-instance __dict__: smaller and faster objects
+    __slots__ = ("_e", "_px", "_py", "_pz")
+
     def __init__(self, e, px, py, pz):
         self.e = e # particle's energy energy
         self.px = px # x component of the momentum
         self.py = py # y component of the momentum
         self.pz = pz # z component of the momentum
 
+    @classmethod
+    def _from_floats(cls, e, px, py, pz):
+        """
+        Trusted constructor for values that are already Python floats, such as the
+        results of arithmetic on other FourVectors. Skips the setter checks;
+        anything coming from outside should go through FourVector(...) instead.
+        """
+        vector = object.__new__(cls)
+        vector._e = e
+        vector._px = px
+        vector._py = py
+        vector._pz = pz
+        return vector
+
 
     def __str__(self):
         return f"(E: {self.e:8.3f}, px: {self.px:8.3f}, py: {self.py:8.3f}, pz: {self.pz:8.3f})"
@@ -129,21 +146,24 @@ class FourVector:
         pz_prime = self.pz + gamma2 * bp * beta_z + gamma * beta_z * self.e
         e_prime = gamma * (self.e + bp)
 
-        return FourVector(e_prime, px_prime, py_prime, pz_prime)
+        return FourVector._from_floats(e_prime, px_prime, py_prime, pz_prime)
 
     def __add__(self, other):
         if not isinstance(other, FourVector):
             return NotImplemented
-        return FourVector(self.e + other.e, self.px + other.px, self.py + other.py, self.pz + other.pz)
+        return FourVector._from_floats(self._e + other._e, self._px + other._px,
+                                       self._py + other._py, self._pz + other._pz)
 
     def __sub__(self, other):
         if not isinstance(other, FourVector):
             return NotImplemented
-        return FourVector(self.e - other.e, self.px - other.px, self.py - other.py, self.pz - other.pz)
+        return FourVector._from_floats(self._e - other._e, self._px - other._px,
+                                       self._py - other._py, self._pz - other._pz)
 
     def __mul__(self, a):
         if isinstance(a, (int, float)):
-            return FourVector(self.e*a, self.px*a, self.py*a, self.pz*a)
+            a = float(a)
+            return FourVector._from_floats(self._e*a, self._px*a, self._py*a, self._pz*a)
         return NotImplemented
 
     def __rmul__(self, a):
@@ -153,7 +173,8 @@ class FourVector:
         if isinstance(a, (int, float)):
             if a == 0:
                 raise ZeroDivisionError
-            return FourVector(self.e/a, self.px/a, self.py/a, self.pz/a)
+            a = float(a)
+            return FourVector._from_floats(self._e/a, self._px/a, self._py/a, self._pz/a)
         return NotImplemented
 
     def dot(self, other):
@@ -184,7 +205,7 @@ class FourVector:
         return (self.e, self.px, self.py, self.pz)[i]
 
     def __neg__(self):
-        return FourVector(-self.e, -self.px, -self.py, -self.pz)
+        return FourVector._from_floats(-self._e, -self._px, -self._py, -self._pz)
 
     def __abs__(self):
         return self.inv_mass
@@ -0,0 +1,216 @@
+import numpy as np
+from FourVector import FourVector
+
+
+class FourVectorArray:
+    """
+    A batch of relativistic four-vectors (E, px, py, pz) stored as one (N, 4)
+    float64 NumPy array. Offers the same derived quantities and operations as
+    FourVector, but every one of them works on all N vectors at once.
+    Indexing with an integer gives a single FourVector back.
+    """
+
+    metric = FourVector.metric
+
+    def __init__(self, data):
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 1 and data.size == 4:
+            data = data.reshape(1, 4)
+        if data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError("FourVectorArray needs an array of shape (N, 4)")
+        self.data = data
+
+    @classmethod
+    def from_components(cls, e, px, py, pz):
+        """Builds the array from four columns (arrays of equal length or scalars)."""
+        return cls(np.stack(np.broadcast_arrays(e, px, py, pz), axis=-1))
+
+    @classmethod
+    def from_list(cls, vectors):
+        """Builds the array from a list of FourVector objects."""
+        return cls(np.array([tuple(vector) for vector in vectors], dtype=np.float64).reshape(-1, 4))
+
+    def to_list(self):
+        """Converts back into a list of FourVector objects."""
+        return [FourVector._from_floats(*row) for row in self.data.tolist()]
+
+    def __str__(self):
+        return "\n".join(str(vector) for vector in self.to_list())
+
+    def __repr__(self):
+        return f"FourVectorArray({len(self)} vectors)"
+
+    # --- Core components ---
+    @property
+    def e(self):
+        return self.data[:, 0]
+
+    @property
+    def px(self):
+        return self.data[:, 1]
+
+    @property
+    def py(self):
+        return self.data[:, 2]
+
+    @property
+    def pz(self):
+        return self.data[:, 3]
+
+    # --- Derived quantities ---
+    @property
+    def p2(self):
+        """Momentum magnitude squared."""
+        return self.px**2 + self.py**2 + self.pz**2
+
+    @property
+    def p(self):
+        """Momentum magnitude."""
+        return np.sqrt(self.p2)
+
+    @property
+    def pt2(self):
+        """Transverse momentum squared."""
+        return self.px**2 + self.py**2
+
+    @property
+    def pt(self):
+        """Transverse momentum."""
+        return np.sqrt(self.pt2)
+
+    @property
+    def inv_mass2(self):
+        """Invariant mass squared (E^2 - |p|^2)."""
+        return self.e**2 - self.p2
+
+    @property
+    def inv_mass(self):
+        """Invariant mass; negative mass squared gives a negative value, as in FourVector."""
+        m2 = self.inv_mass2
+        return np.sign(m2) * np.sqrt(np.abs(m2))
+
+    @property
+    def eta(self):
+        """Pseudorapidity (+-inf for vectors along the beam axis)."""
+        p = self.p
+        pz = self.pz
+        onAxis = p == np.abs(pz)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            eta = 0.5 * np.log((p + pz) / (p - pz))
+        return np.where(onAxis, np.where(pz >= 0, np.inf, -np.inf), eta)
+
+    @property
+    def phi(self):
+        """Azimuthal angle."""
+        return np.arctan2(self.py, self.px)
+
+    # --- Operations ---
+    def boost(self, beta_x=0.0, beta_y=0.0, beta_z=0.0):
+        """
+        Return a new FourVectorArray boosted by velocity beta = (bx, by, bz).
+        Each beta component is a scalar (same boost for all rows) or an array
+        with one value per row. Uses units where c = 1.
+        """
+        beta_x, beta_y, beta_z = (np.asarray(b, dtype=np.float64) for b in (beta_x, beta_y, beta_z))
+        beta2 = beta_x**2 + beta_y**2 + beta_z**2
+        if np.any(beta2 >= 1.0):
+            raise ValueError("Beta^2 must be < 1")
+
+        gamma = 1.0 / np.sqrt(1.0 - beta2)
+        bp = beta_x * self.px + beta_y * self.py + beta_z * self.pz
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gamma2 = np.where(beta2 > 0, (gamma - 1.0) / beta2, 0.0)
+
+        px_prime = self.px + gamma2 * bp * beta_x + gamma * beta_x * self.e
+        py_prime = self.py + gamma2 * bp * beta_y + gamma * beta_y * self.e
+        pz_prime = self.pz + gamma2 * bp * beta_z + gamma * beta_z * self.e
+        e_prime = gamma * (self.e + bp)
+
+        return FourVectorArray.from_components(e_prime, px_prime, py_prime, pz_prime)
+
+    def _Other(self, other):
+        if isinstance(other, FourVectorArray):
+            return other.data
+        if isinstance(other, FourVector):
+            return np.array(tuple(other), dtype=np.float64)
+        return None
+
+    def __add__(self, other):
+        otherData = self._Other(other)
+        if otherData is None:
+            return NotImplemented
+        return FourVectorArray(self.data + otherData)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        otherData = self._Other(other)
+        if otherData is None:
+            return NotImplemented
+        return FourVectorArray(self.data - otherData)
+
+    def __rsub__(self, other):
+        otherData = self._Other(other)
+        if otherData is None:
+            return NotImplemented
+        return FourVectorArray(otherData - self.data)
+
+    def __mul__(self, a):
+        # A scalar, or one factor per row
+        if isinstance(a, (FourVector, FourVectorArray)):
+            return NotImplemented
+        return FourVectorArray(self.data * np.asarray(a, dtype=np.float64).reshape(-1, 1))
+
+    def __rmul__(self, a):
+        return self.__mul__(a)
+
+    def __truediv__(self, a):
+        if isinstance(a, (FourVector, FourVectorArray)):
+            return NotImplemented
+        a = np.asarray(a, dtype=np.float64).reshape(-1, 1)
+        if np.any(a == 0):
+            raise ZeroDivisionError
+        return FourVectorArray(self.data / a)
+
+    def dot(self, other):
+        """Minkowski product row by row (or of every row with one FourVector)."""
+        otherData = self._Other(other)
+        if otherData is None:
+            raise TypeError("dot needs a FourVector or FourVectorArray")
+        return (self.data * otherData) @ np.array(self.metric, dtype=np.float64)
+
+    def __matmul__(self, other):
+        if self._Other(other) is None:
+            return NotImplemented
+        return self.dot(other)
+
+    def __eq__(self, other):
+        """Row-wise equality as a boolean array."""
+        otherData = self._Other(other)
+        if otherData is None:
+            return NotImplemented
+        return np.all(self.data == otherData, axis=-1)
+
+    def __neg__(self):
+        return FourVectorArray(-self.data)
+
+    def __abs__(self):
+        return self.inv_mass
+
+    def sum(self):
+        """Total four-momentum of all rows as a single FourVector."""
+        return FourVector._from_floats(*self.data.sum(axis=0).tolist())
+
+    # --- Container behaviour ---
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        rows = self.data[index]
+        if rows.ndim == 1:
+            return FourVector._from_floats(*rows.tolist())
+        return FourVectorArray(rows)
+
+    def __iter__(self):
+        return iter(self.to_list())
@@ -0,0 +1,147 @@
+import math
+import numpy as np
+
+"""
+Two-sample Kolmogorov-Smirnov test without per-event or per-term Python loops.
+
+The distance D is found with one merge of the two sorted samples: after the
+merge, a running count of each sample's values gives both empirical CDFs at
+every pooled value. P-values are computed for whole arrays of (D, n1, n2)
+at once, either with the asymptotic Kolmogorov series (all terms summed as one
+NumPy expression) or, for small samples, exactly by counting the lattice
+paths that stay within distance D (one cumulative sum per row).
+"""
+
+# Exact p-values are used while n1 * n2 stays below this (cost grows as n1 * n2)
+EXACT_MAX_PRODUCT = 250000
+# Terms of the Kolmogorov series (both forms converge well before this)
+SERIES_TERMS = 100
+
+
+def PooledOrder(sorted1, sorted2):
+    """
+    Merges two sorted samples. Returns, in pooled sorted order, which values
+    come from the first sample, and the position of the last value of every
+    group of equal values (the only places where the ECDFs may be compared).
+    """
+    pooled = np.concatenate((sorted1, sorted2))
+    # A stable sort of two sorted runs is a single merge pass
+    order = np.argsort(pooled, kind="stable")
+    isFirst = order < len(sorted1)
+    sortedValues = pooled[order]
+    groupEnds = np.flatnonzero(np.append(sortedValues[1:] != sortedValues[:-1], True))
+    return isFirst, groupEnds
+
+
+def KSDistance(sorted1, sorted2):
+    """D = max |F1 - F2| of two samples that are already sorted."""
+    n1, n2 = len(sorted1), len(sorted2)
+    if n1 == 0 or n2 == 0:
+        raise ValueError("Both samples must contain at least one event for the KS test.")
+    isFirst, groupEnds = PooledOrder(sorted1, sorted2)
+    # Integer numerator |c1 * n2 - c2 * n1| avoids rounding between the two CDFs
+    count1 = np.cumsum(isFirst)[groupEnds]
+    count2 = groupEnds + 1 - count1
+    return float(np.max(np.abs(count1 * n2 - count2 * n1))) / (n1 * n2)
+
+
+def AsymptoticPvalues(dStats, n1, n2):
+    """
+    Asymptotic p-values P(D >= d) for arrays of (d, n1, n2), using the Kolmogorov
+    series with Stephens' small-sample correction of the effective size.
+    n1 and n2 may be non-integer effective sizes (e.g. of weighted histograms).
+    """
+    dStats, n1, n2 = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (dStats, n1, n2)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        effectiveN = np.sqrt(n1 * n2 / (n1 + n2))
+        lam = (effectiveN + 0.12 + 0.11 / effectiveN) * dStats
+
+    k = np.arange(1, SERIES_TERMS + 1)
+    lam2 = np.maximum(np.nan_to_num(lam), 1e-3)[..., None] ** 2
+    with np.errstate(over="ignore", under="ignore"):
+        # Large lambda: 2 sum (-1)^(k-1) exp(-2 k^2 lambda^2) converges in a few terms
+        signs = np.where(k % 2 == 1, 1.0, -1.0)
+        tailSeries = 2.0 * (np.exp(-2.0 * k * k * lam2) * signs).sum(axis=-1)
+        # Small lambda: that series converges too slowly, so use the equivalent form
+        # of the CDF, sqrt(2 pi) / lambda * sum over odd k of exp(-k^2 pi^2 / (8 lambda^2))
+        oddK = 2 * k - 1
+        cdfSeries = (np.sqrt(2.0 * np.pi / lam2[..., 0])
+                     * np.exp(-oddK * oddK * np.pi ** 2 / (8.0 * lam2)).sum(axis=-1))
+    pValues = np.clip(np.where(lam2[..., 0] < 1.18 ** 2, 1.0 - cdfSeries, tailSeries), 0.0, 1.0)
+    # No distance, or no effective events: nothing to reject
+    return np.where((dStats <= 0) | ~(effectiveN > 0), 1.0, pValues)
+
+
+def KolmogorovPvalue(dStat, n1, n2):
+    """Asymptotic p-value for a single (D, n1, n2)."""
+    return float(AsymptoticPvalues(dStat, n1, n2))
+
+
+def _ExactPvaluesSameSizes(dStats, n1, n2):
+    """
+    Exact P(D >= d) for several d and one pair of sample sizes.
+    Counts the monotone lattice paths from (0, 0) to (n1, n2) that never reach
+    |i * n2 - j * n1| >= d * n1 * n2; every row of the lattice is one cumsum,
+    and all d values are handled together as rows of a 2D array.
+    """
+    # D * n1 * n2 is an integer for every attainable D
+    limits = np.ceil(np.asarray(dStats) * n1 * n2 - 1e-7)[:, None]
+    j = np.arange(n2 + 1)
+    paths = np.where(np.abs(0 * n2 - j * n1) < limits, 1.0, 0.0)
+    paths = np.cumprod(paths, axis=1)  # along the first row a path cannot skip a blocked cell
+    logScale = np.zeros(len(limits))
+
+    for i in range(1, n1 + 1):
+        inside = np.abs(i * n2 - j * n1) < limits
+        paths = np.cumsum(paths * inside, axis=1) * inside
+        # Rescale so the counts (up to binomial(n1 + n2, n1)) never overflow
+        peak = paths.max(axis=1)
+        peak[peak == 0] = 1.0
+        paths /= peak[:, None]
+        logScale += np.log(peak)
+
+    logTotal = math.lgamma(n1 + n2 + 1) - math.lgamma(n1 + 1) - math.lgamma(n2 + 1)
+    with np.errstate(divide="ignore"):
+        stayInside = np.exp(np.log(paths[:, -1]) + logScale - logTotal)
+    return np.clip(1.0 - stayInside, 0.0, 1.0)
+
+
+def KSPvalues(dStats, n1, n2, method="auto"):
+    """
+    P-values P(D >= d) for whole arrays of (d, n1, n2).
+    method: "exact" (lattice-path count), "asymptotic" (Kolmogorov series) or
+    "auto" (exact while n1 * n2 <= EXACT_MAX_PRODUCT). Exact evaluation groups
+    the triples by sample sizes, so many d values for one pair of sizes cost one pass.
+    """
+    if method not in ("auto", "exact", "asymptotic"):
+        raise ValueError("method must be 'auto', 'exact' or 'asymptotic'")
+    dStats, n1, n2 = np.broadcast_arrays(*(np.asarray(x) for x in (dStats, n1, n2)))
+    shape = dStats.shape
+    dStats, n1, n2 = dStats.ravel().astype(np.float64), n1.ravel(), n2.ravel()
+
+    pValues = AsymptoticPvalues(dStats, n1, n2)
+    if method == "asymptotic":
+        return pValues.reshape(shape)
+
+    useExact = (n1 >= 1) & (n2 >= 1) & (dStats > 0)
+    if method == "auto":
+        useExact &= n1.astype(np.float64) * n2 <= EXACT_MAX_PRODUCT
+    if np.any(useExact & ((n1 != np.round(n1)) | (n2 != np.round(n2)))):
+        raise ValueError("exact p-values need integer sample sizes")
+
+    exactRows = np.flatnonzero(useExact)
+    sizes = np.stack((n1[exactRows], n2[exactRows]), axis=1).astype(np.int64)
+    for size1, size2 in np.unique(sizes, axis=0):
+        rows = exactRows[(sizes[:, 0] == size1) & (sizes[:, 1] == size2)]
+        pValues[rows] = _ExactPvaluesSameSizes(dStats[rows], int(size1), int(size2))
+    return pValues.reshape(shape)
+
+
+def KSTest(sample1, sample2, method="auto", presorted=False):
+    """Two-sample KS test. Returns (D, pVal)."""
+    sorted1 = np.asarray(sample1, dtype=np.float64)
+    sorted2 = np.asarray(sample2, dtype=np.float64)
+    if not presorted:
+        sorted1, sorted2 = np.sort(sorted1), np.sort(sorted2)
+    dStat = KSDistance(sorted1, sorted2)
+    return dStat, float(KSPvalues(dStat, len(sorted1), len(sorted2), method))
@@ -0,0 +1,104 @@
+import functools
+import numpy as np
+from FourVector import FourVector
+from FourVectorArray import FourVectorArray
+
+"""
+Lorentz transformations as 4x4 matrices acting on (E, px, py, pz).
+A boost matrix is built once for a given velocity beta and then applied to
+any number of four-momenta with a single matrix multiplication. Matrices of
+frequently used frames are cached, and several transformations can be
+chained into one matrix with Then() (or the @ operator).
+"""
+
+# Minkowski metric as a matrix, used to invert general transformations
+METRIC = np.diag(np.array(FourVector.metric, dtype=np.float64))
+
+
+@functools.lru_cache(maxsize=256)
+def BoostMatrix(beta_x, beta_y, beta_z):
+    """
+    The 4x4 matrix of a pure boost with velocity beta = (bx, by, bz), c = 1.
+    Gives exactly the same transformation as FourVector.boost. The result is
+    cached per beta and returned read-only, so it can be shared safely.
+    """
+    beta = np.array([beta_x, beta_y, beta_z], dtype=np.float64)
+    beta2 = float(beta @ beta)
+    if beta2 >= 1.0:
+        raise ValueError("Beta^2 must be < 1")
+
+    gamma = 1.0 / np.sqrt(1.0 - beta2)
+    gamma2 = (gamma - 1.0) / beta2 if beta2 > 0 else 0.0
+
+    matrix = np.empty((4, 4))
+    matrix[0, 0] = gamma
+    matrix[0, 1:] = gamma * beta
+    matrix[1:, 0] = gamma * beta
+    matrix[1:, 1:] = np.eye(3) + gamma2 * np.outer(beta, beta)
+    matrix.setflags(write=False)
+    return matrix
+
+
+class LorentzBoost:
+    """
+    A Lorentz transformation (a boost, or a chain of boosts) stored as its
+    4x4 matrix. Apply() transforms a FourVector, a FourVectorArray or an
+    (N, 4) array of momenta in one go.
+    """
+
+    def __init__(self, beta_x=0.0, beta_y=0.0, beta_z=0.0):
+        self.beta = (float(beta_x), float(beta_y), float(beta_z))
+        self.matrix = BoostMatrix(*self.beta)
+
+    @classmethod
+    def FromMatrix(cls, matrix):
+        """Wraps an existing 4x4 transformation matrix (e.g. a composed chain)."""
+        transform = cls.__new__(cls)
+        transform.beta = None
+        transform.matrix = np.asarray(matrix, dtype=np.float64)
+        return transform
+
+    @classmethod
+    def ToRestFrameOf(cls, p4):
+        """The boost into the rest frame of a system with total four-momentum 'p4'."""
+        e, px, py, pz = tuple(p4)
+        return cls(-px / e, -py / e, -pz / e)
+
+    @classmethod
+    def FromRestFrameOf(cls, p4):
+        """The boost from the rest frame of 'p4' to the frame in which 'p4' is given."""
+        e, px, py, pz = tuple(p4)
+        return cls(px / e, py / e, pz / e)
+
+    def __repr__(self):
+        if self.beta is not None:
+            return f"LorentzBoost(beta={self.beta})"
+        return "LorentzBoost(composed)"
+
+    def Apply(self, vectors):
+        """Transforms one FourVector, a FourVectorArray or an (N, 4) array."""
+        if isinstance(vectors, FourVector):
+            return FourVector._from_floats(*(self.matrix @ np.array(tuple(vectors))).tolist())
+        if isinstance(vectors, FourVectorArray):
+            return FourVectorArray(vectors.data @ self.matrix.T)
+        return np.asarray(vectors, dtype=np.float64) @ self.matrix.T
+
+    def __call__(self, vectors):
+        return self.Apply(vectors)
+
+    def Then(self, other):
+        """The single transformation 'first self, then other'."""
+        return LorentzBoost.FromMatrix(other.matrix @ self.matrix)
+
+    def __matmul__(self, other):
+        # Same order as matrices: (b2 @ b1) applies b1 first
+        if not isinstance(other, LorentzBoost):
+            return NotImplemented
+        return other.Then(self)
+
+    def Inverse(self):
+        """The transformation that undoes this one."""
+        if self.beta is not None:
+            return LorentzBoost(*(-b for b in self.beta))
+        # For any Lorentz transformation L: L^-1 = g L^T g
+        return LorentzBoost.FromMatrix(METRIC @ self.matrix.T @ METRIC)
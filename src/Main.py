@@ -4,6 +4,8 @@ from MuonToElectron import MuonToElectron
 from ParticleRegistry import ParticleRegistry
 from Analysis import SimulatorComparison
 from Track import TrackFollowing, TrackVisualizer
+from EventFile import EventFile
+from BatchComparison import BatchComparison
 from pathlib import Path
 
 """
@@ -17,7 +19,8 @@ This script integrates all subsystems:
 
 # File names for data storage
 ourFile = "OurOutput.txt"
-pythiaFile = "mumu_EW.txt"
+# The PYTHIA sample is read straight from its CSV export (see ConvertCsv)
+pythiaFile = "mumu_EW.csv"
 
 # The ParticleRegistry acts like a library, containing physical constants
 # for every particle (mass, charge, etc.) stored in a JSON file.
@@ -43,68 +46,68 @@ generator.Run(nEvents=1000, outFile="OurOutput.txt")
 """
 TRACKING AND VISUALIZATION
 Calculates the paths particles take as they move through the detector space.
+The events are read back from the output file through its byte-offset index,
+so this also works for large runs whose events are not kept in memory.
 """
 
-if generator.eventList:
-    # TrackFollowing calculates the 'flight paths' based on momentum vectors
-    tracker = TrackFollowing()
-
-    # 1. Single Event Visualization (Static 3D Image)
-    # This shows where particles flew immediately after a single collision.
-    lastEvent = generator.eventList[-1]
-    allParticles = lastEvent.initialParticles + lastEvent.finalParticles
-    tracksLast = tracker.Solve(allParticles)
-    visualizerLast = TrackVisualizer(tracksLast)
-
-    print(f"\nVisualizing tracks for Event {lastEvent.id} (Static)...")
-    visualizerLast.Plot3d(
-        title=f"Static Track Tracing - Event {lastEvent.id}",
-        savePath=outputsDir / f"event_{lastEvent.id}_static.png"
-    )
-
-    # 2. Single Event Visualization (Animated GIF)
-    # This creates a movie showing the particles expanding outward from the center.
-    print(f"Animating tracks for Event {lastEvent.id}...")
-    ani = visualizerLast.AnimateTracks(
-        title=f"Animated Track Tracing - Event {lastEvent.id}",
-        savePath=outputsDir / f"event_{lastEvent.id}_animated.gif"
-    )
-
-    # 3. Multiple Events Visualization (Static)
-    # Overlays several collisions to show the general 'shape' of the physics process.
-    nMulti = min(5, len(generator.eventList))
-    multiParticles = []
-    for i in range(nMulti):
-        ev = generator.eventList[i]
-        multiParticles.extend(ev.initialParticles + ev.finalParticles)
-
-    tracksMulti = tracker.Solve(multiParticles)
-    visualizerMulti = TrackVisualizer(tracksMulti)
-
-    print(f"Visualizing tracks for first {nMulti} events combined...")
-    visualizerMulti.Plot3d(
-        title=f"Track Tracing - Combined Events (First {nMulti})",
-        savePath=outputsDir / "combined_events_static.png"
-    )
-
-    # 4. Sequential Multi-Collision Visualization (Animated GIF)
-    # Stacks several collisions in the same interaction region to mimic a collider display.
-    nSequence = min(8, len(generator.eventList))
-    sequenceParticles = []
-    for i in range(nSequence):
-        ev = generator.eventList[i]
-        sequenceParticles.extend(ev.initialParticles + ev.finalParticles)
-
-    tracksSequence = tracker.Solve(sequenceParticles)
-    visualizerSequence = TrackVisualizer(tracksSequence)
-
-    print(f"Animating stacked collider view for first {nSequence} events...")
-    visualizerSequence.AnimateCollisionSequence(
-        title=f"Sequential Collider View (First {nSequence} Events)",
-        framesPerEvent=28,
-        holdFrames=4,
-        savePath=outputsDir / "collider_sequence.gif"
-    )
+# The context manager closes the file and its index even if plotting fails
+with EventFile(ourFile, registry) as eventFile:
+
+    if len(eventFile):
+        # TrackFollowing calculates the 'flight paths' based on momentum vectors
+        tracker = TrackFollowing()
+
+        # 1. Single Event Visualization (Static 3D Image)
+        # This shows where particles flew immediately after a single collision.
+        lastEvent = eventFile[-1]
+        allParticles = lastEvent.initialParticles + lastEvent.finalParticles
+        tracksLast = tracker.Solve(allParticles)
+        visualizerLast = TrackVisualizer(tracksLast)
+
+        print(f"\nVisualizing tracks for Event {lastEvent.id} (Static)...")
+        visualizerLast.Plot3d(
+            title=f"Static Track Tracing - Event {lastEvent.id}",
+            savePath=outputsDir / f"event_{lastEvent.id}_static.png"
+        )
+
+        # 2. Single Event Visualization (Animated GIF)
+        # This creates a movie showing the particles expanding outward from the center.
+        print(f"Animating tracks for Event {lastEvent.id}...")
+        ani = visualizerLast.AnimateTracks(
+            title=f"Animated Track Tracing - Event {lastEvent.id}",
+            savePath=outputsDir / f"event_{lastEvent.id}_animated.gif"
+        )
+
+        # 3. Multiple Events Visualization (Static)
+        # Overlays several collisions to show the general 'shape' of the physics process.
+        # The particles of several events are ParticleViews into one table, not separate objects
+        nMulti = min(5, len(eventFile))
+        multiParticles = eventFile.ParticleViews(0, nMulti)
+
+        tracksMulti = tracker.Solve(multiParticles)
+        visualizerMulti = TrackVisualizer(tracksMulti)
+
+        print(f"Visualizing tracks for first {nMulti} events combined...")
+        visualizerMulti.Plot3d(
+            title=f"Track Tracing - Combined Events (First {nMulti})",
+            savePath=outputsDir / "combined_events_static.png"
+        )
+
+        # 4. Sequential Multi-Collision Visualization (Animated GIF)
+        # Stacks several collisions in the same interaction region to mimic a collider display.
+        nSequence = min(8, len(eventFile))
+        sequenceParticles = eventFile.ParticleViews(0, nSequence)
+
+        tracksSequence = tracker.Solve(sequenceParticles)
+        visualizerSequence = TrackVisualizer(tracksSequence)
+
+        print(f"Animating stacked collider view for first {nSequence} events...")
+        visualizerSequence.AnimateCollisionSequence(
+            title=f"Sequential Collider View (First {nSequence} Events)",
+            framesPerEvent=28,
+            holdFrames=4,
+            savePath=outputsDir / "collider_sequence.gif"
+        )
 
 """
 CROSS-VALIDATION
@@ -118,4 +121,13 @@ comparison.Run()
 print("KOLMOGOROV-SMIRNOV TEST ANALYSIS")
 print("="*60)
 ks_result = comparison.KSTest()
-comparison.PrintResult(ks_result)
\ No newline at end of file
+comparison.PrintResult(ks_result)
+
+"""
+BATCH VALIDATION
+Runs the same tests for several observables and particle selections at once.
+Each file is read a single time, and the p-values are corrected (Holm) for the
+number of tests, since among many tests some will look significant by chance.
+"""
+batch = BatchComparison(ourFile, pythiaFile, observables=["cosTheta", "pt", "phi"], pdgSelections=[11, -11])
+batch.PrintTable(batch.Run())
@@ -45,6 +45,17 @@ class MuonToElectron(Process):
         # The (1 + cos^2) distribution is the signature of spin-1/2 particle scattering.
         return 1 + cosTheta ** 2
 
+    def InverseCdfCosTheta(self, uniform):
+        """
+        Exact 'Inverse Transform' sampling of the (1 + cos^2) shape.
+        The CDF is F(c) = (c^3 + 3c + 4) / 8, so solving F(c) = u means solving the
+        cubic c^3 + 3c = 8u - 4. Its single real root is c = 2 sinh(asinh(4u - 2) / 3),
+        which needs one uniform number per event and no rejection loop.
+        """
+        cosTheta = 2.0 * np.sinh(np.arcsinh(4.0 * np.asarray(uniform) - 2.0) / 3.0)
+        # Guard against rounding pushing the endpoints slightly outside [-1, 1]
+        return np.clip(cosTheta, -1.0, 1.0)
+
     def TotalCrossSection(self):
         """
         Calculates the actual probability (area) of this collision happening.
@@ -4,6 +4,11 @@ from ParticleClass import ParticleClass
 
 
 class Particle:
+    # Fixed attribute slots instead of a per-instance __dict__ (see FourVector).
+    # The ParticleClass is not copied: every particle of a type points to the one
+    # shared catalog entry of the ParticleRegistry.
+    __slots__ = ("_particleType", "_p4", "_mother", "_eventID")
+
     def __init__(self, particleType, p4, mother=None, eventID=None):
         # Using nameName convention for internal attributes
         self.particleType = particleType
@@ -11,6 +16,20 @@ class Particle:
         self.mother = mother
         self.eventID = eventID
 
+    @classmethod
+    def _from_trusted(cls, particleType, p4, mother=None, eventID=None):
+        """
+        Trusted constructor for values that are known to be valid, such as the
+        columns of an EventBatch. Skips the setter checks; anything coming from
+        outside should go through Particle(...) instead.
+        """
+        particle = object.__new__(cls)
+        particle._particleType = particleType
+        particle._p4 = p4
+        particle._mother = mother
+        particle._eventID = eventID
+        return particle
+
     @property
     def particleType(self):
         return self._particleType
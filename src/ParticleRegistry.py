@@ -1,6 +1,27 @@
-import json
+import numpy as np
 from pathlib import Path
 from ParticleClass import ParticleClass
+from CatalogCache import LoadCatalog
+
+# Largest range of PDG codes (max - min) that gets a dense slot table, see BuildLookupTables
+MAX_DENSE_PDG_SPAN = 1 << 20
+
+
+def _BuildParticleTypes(data):
+    """Creates a validated ParticleClass instance for every entry of the JSON list."""
+    return [
+        ParticleClass(
+            name=item["name"],
+            pdg=item["pdg"],
+            particle_class=item["particle_class"],
+            mass=item["mass"],
+            charge=item["charge"],
+            stable=item["stable"],
+            decay_modes=item["decay_modes"]
+        )
+        for item in data
+    ]
+
 
 class ParticleRegistry:
     """
@@ -16,7 +37,7 @@ class ParticleRegistry:
 
     def LoadParticles(self, jsonPath):
         """
-        Parses the JSON file and populates the internal lookup dictionaries.
+        Loads the particles of the JSON file and populates the internal lookup dictionaries.
         """
         # Finds the file on your computer, handling different folder structures
         pathObj = Path(jsonPath)
@@ -27,23 +48,77 @@ class ParticleRegistry:
         if not pathObj.exists():
             raise FileNotFoundError(f"Could not find particle data at: {pathObj.absolute()}")
 
-        # Reads the text from the file and converts it into a Python list
-        data = json.loads(pathObj.read_text())
-        for item in data:
-            # Create an instance of ParticleClass for every entry in the JSON
-            pType = ParticleClass(
-                name=item["name"],
-                pdg=item["pdg"],
-                particle_class=item["particle_class"],
-                mass=item["mass"],
-                charge=item["charge"],
-                stable=item["stable"],
-                decay_modes=item["decay_modes"]
-            )
+        # The validated ParticleClass objects come from a compiled snapshot of the
+        # JSON file when one exists (see CatalogCache); otherwise they are built here
+        for pType in LoadCatalog(pathObj, _BuildParticleTypes, kind="registry"):
             # Store the particle object in both dictionaries for easy access
             self.catalogByName[pType.name] = pType
             self.catalogByPdg[pType.pdg] = pType
 
+        self.BuildLookupTables()
+
+    def BuildLookupTables(self):
+        """
+        Copies the catalog into dense NumPy arrays for vectorized lookups.
+        Every known PDG code gets a 'slot' (its position in the sorted code list);
+        mass, charge, stability and class code are stored per slot. One extra
+        slot at the end stands for unknown codes (NaN mass and charge, class -1).
+        A whole PDG column is then mapped to slots, and the slots to properties,
+        with plain fancy indexing.
+        """
+        particleTypes = sorted(self.catalogByPdg.values(), key=lambda pType: pType.pdg)
+        # Names of the particle classes; the class code is the position in this list
+        self.classNames = sorted({pType.particle_class for pType in particleTypes})
+        classCodes = {name: code for code, name in enumerate(self.classNames)}
+
+        self.lookupPdg = np.array([pType.pdg for pType in particleTypes], dtype=np.int64)
+        self.lookupMass = np.array([pType.mass for pType in particleTypes] + [np.nan])
+        self.lookupCharge = np.array([pType.charge for pType in particleTypes] + [np.nan])
+        self.lookupStable = np.array([pType.stable for pType in particleTypes] + [False])
+        self.lookupClass = np.array([classCodes[pType.particle_class] for pType in particleTypes] + [-1],
+                                    dtype=np.int32)
+
+        # Dense slot table over the whole PDG range with an unknown entry on either
+        # side, so clipping any code into range already gives the right slot.
+        # Catalogs with huge codes (e.g. nuclei) fall back to a binary search.
+        unknownSlot = len(particleTypes)
+        self.slotByPdg = None
+        if particleTypes:
+            span = int(self.lookupPdg[-1] - self.lookupPdg[0]) + 1
+            if span <= MAX_DENSE_PDG_SPAN:
+                self.slotByPdg = np.full(span + 2, unknownSlot, dtype=np.int64)
+                self.slotByPdg[self.lookupPdg - self.lookupPdg[0] + 1] = np.arange(unknownSlot)
+
+    def PdgToSlot(self, pdg):
+        """Slot of every PDG code in 'pdg' (the unknown slot for codes not in the catalog)."""
+        pdg = np.asarray(pdg, dtype=np.int64)
+        if self.slotByPdg is not None:
+            shifted = pdg - (self.lookupPdg[0] - 1)
+            return self.slotByPdg[np.clip(shifted, 0, len(self.slotByPdg) - 1)]
+
+        unknownSlot = len(self.lookupPdg)
+        slots = np.searchsorted(self.lookupPdg, pdg)
+        inRange = slots < unknownSlot
+        isKnown = np.zeros(pdg.shape, dtype=bool)
+        isKnown[inRange] = self.lookupPdg[slots[inRange]] == pdg[inRange]
+        return np.where(isKnown, slots, unknownSlot)
+
+    def Masses(self, pdg):
+        """Masses (GeV) for a whole column of PDG codes; NaN for unknown codes."""
+        return self.lookupMass[self.PdgToSlot(pdg)]
+
+    def Charges(self, pdg):
+        """Electric charges for a whole column of PDG codes; NaN for unknown codes."""
+        return self.lookupCharge[self.PdgToSlot(pdg)]
+
+    def IsStable(self, pdg):
+        """Stability flags for a whole column of PDG codes; False for unknown codes."""
+        return self.lookupStable[self.PdgToSlot(pdg)]
+
+    def ClassCodes(self, pdg):
+        """Class codes (index into self.classNames) for a column of PDG codes; -1 if unknown."""
+        return self.lookupClass[self.PdgToSlot(pdg)]
+
     def GetByPdg(self, pdg):
         """Returns the particle data matching a specific numeric ID."""
         return self.catalogByPdg.get(pdg)
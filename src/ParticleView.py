@@ -0,0 +1,95 @@
+from FourVector import FourVector
+from EventStore import MOTHER_NONE, MOTHER_COLLISION, MOTHER_UNKNOWN
+
+"""
+Particle objects that do not hold any data of their own.
+A ParticleView is only a reference to one row of a ParticleTable: the PDG code,
+mother and four-momentum are read from the table's columns when asked for, and
+the particle type (name, mass, charge, ...) comes from the shared catalog of the
+ParticleRegistry. Millions of particles therefore cost one set of NumPy arrays
+instead of several Python objects each.
+"""
+
+# What the special mother codes of the table stand for, as in the text format
+MOTHER_LABELS = {MOTHER_COLLISION: "Collision", MOTHER_UNKNOWN: "Unknown"}
+
+
+class ParticleView:
+    """
+    Read-only stand-in for a Particle, backed by row 'row' of a ParticleTable.
+    Offers the same attributes as Particle (particleType, p4, mother, eventID,
+    pdg, mass, charge), so it can be printed and analysed like one.
+    """
+
+    __slots__ = ("table", "row", "registry")
+
+    def __init__(self, table, row, registry):
+        self.table = table
+        self.row = row
+        self.registry = registry
+
+    @property
+    def pdg(self):
+        return int(self.table.pdg[self.row])
+
+    @property
+    def particleType(self):
+        # The registry hands back its single catalog entry for this PDG code
+        return self.registry.GetByPdg(self.pdg)
+
+    @property
+    def mass(self):
+        return self.particleType.mass
+
+    @property
+    def charge(self):
+        return self.particleType.charge
+
+    @property
+    def p4(self):
+        table, row = self.table, self.row
+        return FourVector._from_floats(float(table.e[row]), float(table.px[row]),
+                                       float(table.py[row]), float(table.pz[row]))
+
+    @property
+    def eventID(self):
+        return int(self.table.eventId[self.row])
+
+    @property
+    def mother(self):
+        """None for a beam particle, a label string, or the mother's own ParticleView."""
+        code = int(self.table.mother[self.row])
+        if code == MOTHER_NONE:
+            return None
+        if code < 0:
+            return MOTHER_LABELS[code]
+        # Non-negative codes are the mother's row inside the same event
+        eventStart = self._EventStart()
+        return ParticleView(self.table, eventStart + code, self.registry)
+
+    def _EventStart(self):
+        offsets = self.table.eventOffsets
+        # Last event offset at or before this row
+        return int(offsets[offsets.searchsorted(self.row, side="right") - 1])
+
+    def __eq__(self, other):
+        if not isinstance(other, ParticleView):
+            return NotImplemented
+        return self.table is other.table and self.row == other.row
+
+    def __hash__(self):
+        return hash((id(self.table), self.row))
+
+    def __str__(self):
+        mother = self.mother
+        if isinstance(mother, ParticleView):
+            motherStr = mother.particleType.name
+        else:
+            motherStr = mother if mother else "Initial Beam"
+        return f"{self.eventID:03d} | {self.pdg:>3} | {motherStr:<12} | {self.p4}"
+
+
+def EventParticles(table, index, registry):
+    """ParticleViews of all particles of the event at position 'index' of 'table'."""
+    rows = table.EventSlice(index)
+    return [ParticleView(table, row, registry) for row in range(rows.start, rows.stop)]
@@ -67,6 +67,34 @@ class Process:
             raise ValueError("notes must be a string")
         self.internalNotes = value
 
+    def SetBeams(self, beamMinus, beamPlus):
+        """
+        Derives the collision energy from the two beam four-momenta.
+        sqrt(s) is the invariant mass of the two-beam system, so it is the same
+        in every frame: symmetric collider, asymmetric collider or fixed target.
+        """
+        sqrtS = (beamMinus + beamPlus).inv_mass
+        if not sqrtS > 0:
+            raise ValueError("the beams must have a positive invariant mass")
+        self.sqrtS = sqrtS
+        self.sVal = sqrtS ** 2
+        return sqrtS
+
+    def HasInverseCdf(self):
+        """
+        Tells whether this process provides an exact inverse-CDF sampler for
+        cos(theta), i.e. whether a subclass overrides InverseCdfCosTheta.
+        """
+        return type(self).InverseCdfCosTheta is not Process.InverseCdfCosTheta
+
+    def InverseCdfCosTheta(self, uniform):
+        """
+        Optional hook for 'Inverse Transform' sampling: maps uniform random
+        numbers in [0, 1) onto cos(theta) following the Differential Cross Section.
+        Processes whose angular distribution has an invertible CDF override this.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no inverse-CDF sampler")
+
     def __repr__(self):
         """Returns a technical string representation of the object."""
         return f"Process(name={self.Name!r}, model={self.Model!r})"
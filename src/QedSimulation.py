@@ -1,6 +1,11 @@
 import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from Particle import Particle
 from FourVector import FourVector
+from EventStore import EventStoreWriter, TableFromBatch, TableFromEvents
+from EventIndex import EventIndexBuilder
+from LorentzBoost import LorentzBoost
 from pathlib import Path
 
 
@@ -17,6 +22,115 @@ class Event:
         self.finalParticles = finalParticles
 
 
+class EventBatch:
+    """
+    A columnar block of events produced by the batch generation mode.
+    Instead of one Particle/FourVector object per particle, the four-momenta of
+    every event are stored in a single NumPy array of shape
+    (nEvents, nParticles, 4) holding (E, px, py, pz).
+    Event objects are only built when somebody asks for a specific event.
+    """
+
+    def __init__(self, eventIds, particleTypes, mothers, nInitial, p4):
+        # eventIds: one integer ID per event (row of p4)
+        self.eventIds = np.asarray(eventIds, dtype=np.int64)
+        # particleTypes / mothers: one entry per particle slot, shared by all events
+        self.particleTypes = list(particleTypes)
+        self.mothers = list(mothers)
+        # The first 'nInitial' slots are the incoming beams, the rest the final state
+        self.nInitial = nInitial
+        self.p4 = np.asarray(p4, dtype=float)
+
+    def __len__(self):
+        return len(self.eventIds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.GetEvent(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("event index out of range")
+        return self.GetEvent(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.GetEvent(i)
+
+    def GetEvent(self, index):
+        """Builds the Event object for the event stored at row 'index'."""
+        eventID = int(self.eventIds[index])
+        particles = []
+        # tolist() hands back Python floats and the slot types come from the registry,
+        # so the trusted constructors can be used
+        for slot, values in enumerate(self.p4[index].tolist()):
+            particles.append(Particle._from_trusted(
+                self.particleTypes[slot],
+                FourVector._from_floats(*values),
+                mother=self.mothers[slot],
+                eventID=eventID
+            ))
+        return Event(eventID, particles[:self.nInitial], particles[self.nInitial:])
+
+    def SerializeLines(self):
+        """
+        Yields the text representation of every event, formatted exactly like
+        QedSimulation.SerializeEvent, without building any Particle objects.
+        """
+        # The PDG code and mother column are the same for every event, so the
+        # fixed part of each particle line is prepared only once.
+        templates = []
+        for particleType, mother in zip(self.particleTypes, self.mothers):
+            motherStr = str(mother) if mother else "Initial Beam"
+            templates.append(
+                "    {:03d} | " + f"{particleType.pdg:>3} | {motherStr:<12} | "
+                + "(E: {:8.3f}, px: {:8.3f}, py: {:8.3f}, pz: {:8.3f})"
+            )
+
+        for eventID, momenta in zip(self.eventIds.tolist(), self.p4.tolist()):
+            lines = [f"Event {eventID}"]
+            for template, values in zip(templates, momenta):
+                lines.append(template.format(eventID, *values))
+            yield "\n".join(lines)
+
+
+def _SampleBlockAngles(activeProcess, useInverseCdf, nEvents, seedSequence):
+    """
+    Worker task for QedSimulation.GenerateParallel: samples the angles of one
+    block of events from its own random stream.
+    Lives at module level so the process pool can pickle it.
+    """
+    rng = np.random.default_rng(seedSequence)
+    simulation = QedSimulation(activeProcess, particleRegistry=None)
+    simulation.useInverseCdf = useInverseCdf
+
+    cosTheta = simulation.SampleCosThetaBatch(nEvents, rng=rng)
+    phiVal = rng.uniform(0, 2 * np.pi, nEvents)
+    return cosTheta, phiVal, simulation.samplingStats
+
+
+def _RotationFromZ(nx, ny, nz):
+    """
+    4x4 matrix of the rotation that turns the +z axis into the direction (nx, ny, nz).
+    Energy is untouched; the 3x3 spatial part follows Rodrigues' rotation formula.
+    """
+    direction = np.array([nx, ny, nz], dtype=np.float64)
+    direction /= np.sqrt(direction @ direction)
+    rotation = np.eye(4)
+    cosAngle = direction[2]
+    if cosAngle <= -1.0 + 1e-15:
+        # Pointing along -z: turn by 180 degrees about the x axis
+        rotation[2, 2] = rotation[3, 3] = -1.0
+        return rotation
+
+    # Rotation axis z x n (not normalised) written as a cross-product matrix
+    cross = np.array([[0.0, 0.0, direction[0]],
+                      [0.0, 0.0, direction[1]],
+                      [-direction[0], -direction[1], 0.0]])
+    rotation[1:, 1:] += cross + cross @ cross / (1.0 + cosAngle)
+    return rotation
+
+
 class QedSimulation:
     """
     The main simulation engine. It uses Monte Carlo methods to
@@ -27,15 +141,71 @@ class QedSimulation:
         self.activeProcess = activeProcess
         self.particleRegistry = particleRegistry
         self.eventList = []
+        # Prefer the process' exact inverse-CDF sampler over rejection when it has one
+        self.useInverseCdf = True
+        # Bookkeeping of the sampling cost (see SamplingEfficiency)
+        self.samplingStats = {"trials": 0, "accepted": 0, "samples": 0, "randoms": 0}
+        # Lab-frame beams (see SetBeams); None means the symmetric collider along z
+        self.beams = None
+        self.labTransform = None
+        # (sqrtS, sVal) of the process before the first SetBeams, restored on reset
+        self.symmetricEnergy = None
+
+    def SetBeams(self, beamMinus, beamPlus):
+        """
+        Generates the events in the lab frame of two beams given as FourVectors
+        (mu- and mu+), e.g. an asymmetric collider or a fixed target.
+        sqrt(s) of the process is derived from the beams. The scattering is still
+        done in the centre-of-mass frame, where the cross-section formulas hold,
+        and the final states are then carried to the lab frame by one 4x4 matrix
+        applied to a whole batch at once. SetBeams(None, None) goes back to the
+        symmetric collider, with the process' original sqrt(s).
+        """
+        if beamMinus is None and beamPlus is None:
+            if self.symmetricEnergy is not None:
+                self.activeProcess.sqrtS, self.activeProcess.sVal = self.symmetricEnergy
+                self.symmetricEnergy = None
+            self.beams = None
+            self.labTransform = None
+            return
+
+        if self.symmetricEnergy is None:
+            self.symmetricEnergy = (self.activeProcess.sqrtS, self.activeProcess.sVal)
+        self.activeProcess.SetBeams(beamMinus, beamPlus)
+        toCm = LorentzBoost.ToRestFrameOf(beamMinus + beamPlus)
+
+        # In the CM frame the generator puts the mu- beam along +z. Rotating +z onto the
+        # real beam direction first also handles beams that do not collide head-on.
+        beamAxis = toCm.Apply(beamMinus)
+        rotation = LorentzBoost.FromMatrix(_RotationFromZ(beamAxis.px, beamAxis.py, beamAxis.pz))
+        self.labTransform = rotation.Then(toCm.Inverse())
+        self.beams = (beamMinus, beamPlus)
+
+    def _RecordSampling(self, trials, accepted, samples, randoms):
+        self.samplingStats["trials"] += trials
+        self.samplingStats["accepted"] += accepted
+        self.samplingStats["samples"] += samples
+        self.samplingStats["randoms"] += randoms
+
+    def _UsesInverseCdf(self):
+        return self.useInverseCdf and self.activeProcess.HasInverseCdf()
 
     def SampleCosTheta(self):
         """
         Uses the 'Acceptance-Rejection' method to determine the scattering angle.
         It generates random candidates and keeps them only if they
         match the probability distribution of the physics process.
+        If the process offers an exact inverse-CDF sampler, that is used instead
+        and a single random number is enough.
         """
+        if self._UsesInverseCdf():
+            self._RecordSampling(1, 1, 1, 1)
+            return float(self.activeProcess.InverseCdfCosTheta(np.random.uniform(0, 1)))
+
         maxWeight = self.activeProcess.GetMaxWeight()
+        trials = 0
         while True:
+            trials += 1
             # Pick a random candidate for the cosine of the angle
             cosineCandidate = np.random.uniform(-1, 1)
             # Pick a random vertical value to check against the physics curve
@@ -43,8 +213,239 @@ class QedSimulation:
 
             # If the value is below the Differential Cross Section curve, accept it.
             if checkValue <= self.activeProcess.DifferentialCrossSection(cosineCandidate):
+                self._RecordSampling(trials, 1, 1, 2 * trials)
                 return cosineCandidate
 
+    def SampleCosThetaBatch(self, nSamples, rng=None):
+        """
+        Vectorized 'Acceptance-Rejection' sampling of 'nSamples' cos(theta) values.
+        Candidates are drawn in blocks and the Differential Cross Section is
+        evaluated on the whole block at once. The block size is chosen from the
+        acceptance rate observed so far, so usually a single block is enough.
+        Processes with an inverse-CDF sampler skip the rejection step entirely.
+        'rng' is an optional NumPy Generator; by default the global np.random is used.
+        """
+        if rng is None:
+            rng = np.random
+
+        if self._UsesInverseCdf():
+            self._RecordSampling(nSamples, nSamples, nSamples, nSamples)
+            return self.activeProcess.InverseCdfCosTheta(rng.uniform(0, 1, nSamples))
+
+        maxWeight = self.activeProcess.GetMaxWeight()
+        acceptedBlocks = []
+        nAccepted = 0
+
+        while nAccepted < nSamples:
+            # Use the acceptance rate seen so far; assume 50% before any trial
+            if self.samplingStats["trials"] > 0:
+                acceptRate = self.samplingStats["accepted"] / self.samplingStats["trials"]
+            else:
+                acceptRate = 0.5
+            acceptRate = max(acceptRate, 1e-3)
+            nCandidates = int((nSamples - nAccepted) / acceptRate * 1.05) + 16
+
+            candidates = rng.uniform(-1, 1, nCandidates)
+            checks = rng.uniform(0, maxWeight, nCandidates)
+            kept = candidates[checks <= self.activeProcess.DifferentialCrossSection(candidates)]
+
+            self._RecordSampling(nCandidates, kept.size, 0, 2 * nCandidates)
+            acceptedBlocks.append(kept)
+            nAccepted += kept.size
+
+        self._RecordSampling(0, 0, nSamples, 0)
+        return np.concatenate(acceptedBlocks)[:nSamples]
+
+    def SamplingEfficiency(self):
+        """
+        Summarizes how expensive the cos(theta) sampling has been so far
+        for the active Process.
+        """
+        trials = self.samplingStats["trials"]
+        accepted = self.samplingStats["accepted"]
+        samples = self.samplingStats["samples"]
+        randoms = self.samplingStats["randoms"]
+
+        return {
+            "process": type(self.activeProcess).__name__,
+            "trials": trials,
+            "accepted": accepted,
+            "samples": samples,
+            "efficiency": accepted / trials if trials else float("nan"),
+            "trialsPerSample": trials / samples if samples else float("nan"),
+            "randomsPerSample": randoms / samples if samples else float("nan"),
+        }
+
+    def PrintSamplingEfficiency(self):
+        """Prints the sampling cost summary in the console."""
+        stats = self.SamplingEfficiency()
+        print(f"Sampling ({stats['process']}): {stats['samples']} samples from {stats['trials']} trials")
+        print(f"  efficiency        : {stats['efficiency']:.3f}")
+        print(f"  trials per sample : {stats['trialsPerSample']:.3f}")
+        print(f"  randoms per sample: {stats['randomsPerSample']:.3f}")
+
+    def _SampleAnglesBatch(self, nEvents):
+        """
+        Samples cos(theta) and phi for 'nEvents' events at once.
+        The random numbers are consumed in exactly the same order as the
+        per-event loop (rejection trials or one inverse-CDF number for cos(theta),
+        then one phi), so under a fixed seed the batch mode reproduces the
+        per-event events.
+        """
+        if self._UsesInverseCdf():
+            # Exactly two numbers per event: the inverse-CDF uniform and phi
+            stream = np.random.uniform(0, 1, 2 * nEvents)
+            self._RecordSampling(nEvents, nEvents, nEvents, nEvents)
+            cosThetas = self.activeProcess.InverseCdfCosTheta(stream[0::2])
+            return cosThetas, 2 * np.pi * stream[1::2]
+
+        maxWeight = self.activeProcess.GetMaxWeight()
+        startState = np.random.get_state()
+
+        stream = np.empty(0)
+        cosThetas = np.empty(nEvents)
+        phis = np.empty(nEvents)
+        position = 0
+        filled = 0
+        trials = 0
+        # Rough first guess: a couple of trials (two numbers each) plus phi per event
+        nDraw = 5 * nEvents + 64
+
+        while filled < nEvents:
+            stream = np.concatenate((stream, np.random.random_sample(nDraw)))
+            nStream = stream.size
+
+            # accepted[j]: a trial starting at position j of the stream is accepted
+            candidates = -1.0 + 2.0 * stream[:-1]
+            checks = maxWeight * stream[1:]
+            accepted = checks <= self.activeProcess.DifferentialCrossSection(candidates)
+
+            # nextAccepted[j]: first accepted trial at j, j+2, j+4, ... (same parity)
+            indices = np.where(accepted, np.arange(nStream - 1), nStream)
+            nextAccepted = np.empty(nStream - 1, dtype=np.int64)
+            for parity in (0, 1):
+                reverse = indices[parity::2][::-1]
+                nextAccepted[parity::2] = np.minimum.accumulate(reverse)[::-1]
+            nextAccepted = nextAccepted.tolist()
+
+            # Walk the stream event by event: accepted trial, then phi
+            while filled < nEvents and position < nStream - 1:
+                trial = nextAccepted[position]
+                if trial + 2 >= nStream:
+                    break
+                cosThetas[filled] = candidates[trial]
+                phis[filled] = 2 * np.pi * stream[trial + 2]
+                trials += (trial - position) // 2 + 1
+                filled += 1
+                position = trial + 3
+
+            # Estimate how many more numbers are needed from the acceptance rate
+            acceptRate = max(float(np.mean(accepted)), 1e-3)
+            nDraw = int((nEvents - filled) * (2.0 / acceptRate + 1) * 1.1) + 64
+
+        # Rewind the global generator so it ends exactly where the loop would have
+        np.random.set_state(startState)
+        np.random.random_sample(position)
+        self._RecordSampling(trials, nEvents, nEvents, 2 * trials)
+
+        return cosThetas, phis
+
+    def GenerateBatch(self, nEvents, firstEventId=0, exactStream=True):
+        """
+        Generates 'nEvents' events as one columnar EventBatch.
+        All angles and momenta are computed as NumPy arrays; no Particle or
+        FourVector objects are created here.
+        With exactStream=False the block sampler SampleCosThetaBatch is used
+        instead; it is faster but draws the random numbers in a different order
+        than the per-event loop.
+        """
+        if exactStream:
+            cosTheta, phiVal = self._SampleAnglesBatch(nEvents)
+        else:
+            cosTheta = self.SampleCosThetaBatch(nEvents)
+            phiVal = np.random.uniform(0, 2 * np.pi, nEvents)
+
+        return self._BuildBatch(cosTheta, phiVal, firstEventId)
+
+    def GenerateParallel(self, nEvents, seed, nWorkers=None, blockSize=100000, firstEventId=0):
+        """
+        Generates 'nEvents' events on several CPU cores and returns one EventBatch.
+        The run is cut into fixed blocks of 'blockSize' events, and every block
+        gets its own random stream spawned from the master 'seed' via
+        np.random.SeedSequence. Blocks are merged back in event-ID order, so the
+        result is bit-identical for any number of workers.
+        Scripts calling this must guard their entry point with
+        'if __name__ == "__main__":' on platforms that spawn worker processes.
+        """
+        if seed is None:
+            # SeedSequence(None) would draw fresh OS entropy, so the run could not be repeated
+            raise ValueError("GenerateParallel needs an explicit master 'seed'")
+        nBlocks = max(1, -(-nEvents // blockSize))
+        blockSizes = [min(blockSize, nEvents - i * blockSize) for i in range(nBlocks)]
+        streams = np.random.SeedSequence(seed).spawn(nBlocks)
+        tasks = [(self.activeProcess, self.useInverseCdf, n, stream)
+                 for n, stream in zip(blockSizes, streams)]
+
+        if nWorkers == 1:
+            results = [_SampleBlockAngles(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=nWorkers) as pool:
+                # map() hands back the blocks in submission (= event-ID) order
+                results = list(pool.map(_SampleBlockAngles, *zip(*tasks)))
+
+        for _, _, blockStats in results:
+            for key, value in blockStats.items():
+                self.samplingStats[key] += value
+
+        cosTheta = np.concatenate([result[0] for result in results])
+        phiVal = np.concatenate([result[1] for result in results])
+        return self._BuildBatch(cosTheta, phiVal, firstEventId)
+
+    def _BuildBatch(self, cosTheta, phiVal, firstEventId):
+        """Turns arrays of scattering angles into the columnar momenta of an EventBatch."""
+        muonType, antiMuonType, electronType, positronType = self._ParticleTypes()
+        nEvents = len(cosTheta)
+        energyBeam = self.activeProcess.sqrtS / 2.0
+
+        sinTheta = np.sqrt(1 - cosTheta ** 2)
+
+        pxVal = energyBeam * sinTheta * np.cos(phiVal)
+        pyVal = energyBeam * sinTheta * np.sin(phiVal)
+        pzVal = energyBeam * cosTheta
+
+        # Slots: mu-, mu+ (beams along +z / -z), then the back-to-back e- and e+
+        p4 = np.zeros((nEvents, 4, 4))
+        p4[:, :, 0] = energyBeam
+        p4[:, 0, 3] = energyBeam
+        p4[:, 1, 3] = -energyBeam
+        p4[:, 2, 1], p4[:, 2, 2], p4[:, 2, 3] = pxVal, pyVal, pzVal
+        p4[:, 3, 1], p4[:, 3, 2], p4[:, 3, 3] = -pxVal, -pyVal, -pzVal
+
+        if self.labTransform is not None:
+            # Carry the final states from the CM to the lab frame in one matrix product,
+            # and store the beams exactly as they were given
+            finalStates = p4[:, 2:].reshape(-1, 4)
+            p4[:, 2:] = self.labTransform.Apply(finalStates).reshape(nEvents, 2, 4)
+            p4[:, 0] = tuple(self.beams[0])
+            p4[:, 1] = tuple(self.beams[1])
+
+        return EventBatch(
+            eventIds=np.arange(firstEventId, firstEventId + nEvents),
+            particleTypes=[muonType, antiMuonType, electronType, positronType],
+            mothers=[None, None, "Collision", "Collision"],
+            nInitial=2,
+            p4=p4
+        )
+
+    def _ParticleTypes(self):
+        """Retrieves the incoming and outgoing particle definitions from the registry."""
+        return (
+            self.particleRegistry.GetByPdg(self.activeProcess.PdgetIn[0]),
+            self.particleRegistry.GetByPdg(self.activeProcess.PdgetIn[1]),
+            self.particleRegistry.GetByPdg(self.activeProcess.PdgetOut[0]),
+            self.particleRegistry.GetByPdg(self.activeProcess.PdgetOut[1]),
+        )
+
     def SerializeEvent(self, event):
         """
         Converts the Event data into a formatted string that
@@ -61,74 +462,195 @@ class QedSimulation:
 
         return "\n".join(lines)
 
-    def WriteOutput(self, outFile):
-        """
-        Saves all generated events into a text file within the 'outputs' directory.
-        """
+    def _OutputPath(self, outFile):
+        """Builds the path of an output file inside the 'outputs' directory."""
         projectRoot = Path(__file__).resolve().parent.parent
         outputPath = projectRoot / "outputs" / outFile
         outputPath.parent.mkdir(parents=True, exist_ok=True)
+        return outputPath
 
-        with open(outputPath, "w") as file:
-            for event in self.eventList:
-                serialized = self.SerializeEvent(event)
-                file.write(serialized + "\n\n")
+    def WriteOutput(self, outFile, fileFormat="text"):
+        """
+        Saves all generated events into a text file within the 'outputs' directory.
+        With fileFormat="npy" the events are written as a columnar binary
+        event store (a directory of .npy arrays, see EventStore) instead.
+        """
+        outputPath = self._OutputPath(outFile)
+
+        if fileFormat == "npy":
+            with EventStoreWriter(outputPath) as writer:
+                if isinstance(self.eventList, EventBatch):
+                    writer.Append(TableFromBatch(self.eventList))
+                else:
+                    writer.Append(TableFromEvents(self.eventList))
+            print(f"\nEvent store written to: {outputPath}")
+            return
+        if fileFormat != "text":
+            raise ValueError(f"Unknown output format: {fileFormat!r}")
+
+        # The byte size of every event goes into the sidecar index (see EventIndex);
+        # newline="\n" and a fixed encoding keep those sizes equal to the bytes on disk
+        # on every platform; the size is counted in encoded bytes, not characters.
+        indexBuilder = EventIndexBuilder()
+        with open(outputPath, "w", encoding="utf-8", newline="\n") as file:
+            if isinstance(self.eventList, EventBatch):
+                # Columnar events are formatted straight from the momentum arrays
+                for eventID, serialized in zip(self.eventList.eventIds.tolist(), self.eventList.SerializeLines()):
+                    file.write(serialized + "\n\n")
+                    indexBuilder.Add(eventID, len(serialized.encode("utf-8")) + 2)
+            else:
+                for event in self.eventList:
+                    serialized = self.SerializeEvent(event)
+                    file.write(serialized + "\n\n")
+                    indexBuilder.Add(event.id, len(serialized.encode("utf-8")) + 2)
+        indexBuilder.Save(outputPath)
 
         print(f"\nOutput written to: {outputPath}")
 
-    def Run(self, nEvents, outFile, previewEvents=3):
+    def GenerateChunks(self, nEvents, chunkSize=100000, exactStream=True):
         """
-        The main execution loop. It creates the incoming beams,
-        calculates the collision results, and stores the events.
+        Generator version of GenerateBatch: yields the run as consecutive
+        EventBatch chunks of at most 'chunkSize' events, so only one chunk
+        has to live in memory at a time.
         """
+        for firstEventId in range(0, nEvents, chunkSize):
+            nChunk = min(chunkSize, nEvents - firstEventId)
+            yield self.GenerateBatch(nChunk, firstEventId=firstEventId, exactStream=exactStream)
+
+    def WriteStream(self, chunks, outFile, fileFormat="text"):
+        """
+        Writes EventBatch chunks to the output file as they are produced.
+        Each chunk is formatted into one buffer, written and flushed, so a crash
+        only loses the chunk in progress. The chunks are passed on afterwards,
+        which lets this step sit in the middle of a generator pipeline.
+        fileFormat="npy" appends the chunks to a binary event store instead.
+        """
+        outputPath = self._OutputPath(outFile)
+
+        if fileFormat == "npy":
+            with EventStoreWriter(outputPath) as writer:
+                for chunk in chunks:
+                    writer.Append(TableFromBatch(chunk))
+                    yield chunk
+            print(f"\nEvent store written to: {outputPath}")
+            return
+        if fileFormat != "text":
+            raise ValueError(f"Unknown output format: {fileFormat!r}")
+
+        indexBuilder = EventIndexBuilder()
+        with open(outputPath, "w", encoding="utf-8", newline="\n") as file:
+            for chunk in chunks:
+                serializedEvents = list(chunk.SerializeLines())
+                file.write("".join(serialized + "\n\n" for serialized in serializedEvents))
+                file.flush()
+                for eventID, serialized in zip(chunk.eventIds.tolist(), serializedEvents):
+                    indexBuilder.Add(eventID, len(serialized.encode("utf-8")) + 2)
+                yield chunk
+        indexBuilder.Save(outputPath)
+
+        print(f"\nOutput written to: {outputPath}")
+
+    def RunStreaming(self, nEvents, outFile, chunkSize=100000, keepLast=10, previewEvents=3,
+                     fileFormat="text"):
+        """
+        Streaming version of Run for very large productions.
+        Events flow through GenerateChunks -> WriteStream and are written while
+        the run progresses. Only the last 'keepLast' events are kept in
+        eventList (e.g. for visualization); keepLast=None keeps every event.
+        """
+        self._PrintHeader()
+
+        if keepLast is None:
+            self.eventList = []
+        else:
+            self.eventList = deque(maxlen=keepLast)
+
+        nWritten = 0
+        chunks = self.GenerateChunks(nEvents, chunkSize)
+        for chunk in self.WriteStream(chunks, outFile, fileFormat=fileFormat):
+            if nWritten == 0:
+                for event in chunk[:previewEvents]:
+                    print(self.SerializeEvent(event))
+                    print("-" * 90)
+
+            # Only build Event objects for the events that are retained
+            if keepLast is None:
+                self.eventList.extend(chunk)
+            elif keepLast > 0:
+                self.eventList.extend(chunk[-keepLast:])
+            nWritten += len(chunk)
+
+        print(f"{nWritten} events streamed to disk, {len(self.eventList)} kept in memory.")
+
+    def _PrintHeader(self):
         print("=" * 90)
         print(f"STARTING SIMULATION: {self.activeProcess.processName}")
         print(f"Total Cross Section: {self.activeProcess.TotalCrossSection():.6f} nb")
         print("=" * 90)
 
+    def Run(self, nEvents, outFile, previewEvents=3, batch=False, nWorkers=None, seed=None,
+            fileFormat="text"):
+        """
+        The main execution loop. It creates the incoming beams,
+        calculates the collision results, and stores the events.
+        With batch=True all events are generated at once as an EventBatch.
+        Passing 'nWorkers' generates the events in parallel from the master 'seed'
+        (see GenerateParallel) instead of the global np.random state; 'seed' is
+        then required, otherwise a ValueError is raised.
+        'fileFormat' selects the output format (see WriteOutput).
+        """
+        if nWorkers is not None and seed is None:
+            raise ValueError("Run with 'nWorkers' needs a master 'seed' to be reproducible")
+
+        self._PrintHeader()
+
         # Retrieve particle definitions (mass, charge, etc.) from the registry
-        muonType = self.particleRegistry.GetByPdg(self.activeProcess.PdgetIn[0])
-        antiMuonType = self.particleRegistry.GetByPdg(self.activeProcess.PdgetIn[1])
-        electronType = self.particleRegistry.GetByPdg(self.activeProcess.PdgetOut[0])
-        positronType = self.particleRegistry.GetByPdg(self.activeProcess.PdgetOut[1])
-
-        for i in range(nEvents):
-            # Calculate beam energy (E = sqrt(s) / 2)
-            energyBeam = self.activeProcess.sqrtS / 2.0
-
-            # Define initial particles flying along the Z-axis in opposite directions
-            muMinus = Particle(muonType, FourVector(energyBeam, 0, 0, energyBeam), eventID=i)
-            muPlus = Particle(antiMuonType, FourVector(energyBeam, 0, 0, -energyBeam), eventID=i)
-
-            # Determine the outgoing trajectory using random sampling
-            cosTheta = self.SampleCosTheta()
-            phiVal = np.random.uniform(0, 2 * np.pi)  # Azimuthal angle (rotation around the beam)
-            sinTheta = np.sqrt(1 - cosTheta ** 2)
-
-            # Convert angles into 3D momentum components (px, py, pz)
-            pxVal = energyBeam * sinTheta * np.cos(phiVal)
-            pyVal = energyBeam * sinTheta * np.sin(phiVal)
-            pzVal = energyBeam * cosTheta
-
-            # Create the 'Final State' particles (Electron and Positron)
-            # They are emitted 'back-to-back' to conserve total momentum.
-            p1 = Particle(
-                electronType,
-                FourVector(energyBeam, pxVal, pyVal, pzVal),
-                mother="Collision",
-                eventID=i
-            )
+        muonType, antiMuonType, electronType, positronType = self._ParticleTypes()
 
-            p2 = Particle(
-                positronType,
-                FourVector(energyBeam, -pxVal, -pyVal, -pzVal),
-                mother="Collision",
-                eventID=i
-            )
+        if nWorkers is not None:
+            self.eventList = self.GenerateParallel(nEvents, seed, nWorkers=nWorkers)
+        elif batch or self.beams is not None:
+            # Lab-frame beams always take the batch path, so the boost is one matrix
+            # product instead of one per particle; it draws the same random numbers
+            self.eventList = self.GenerateBatch(nEvents)
+        else:
+            for i in range(nEvents):
+                # Calculate beam energy (E = sqrt(s) / 2)
+                energyBeam = self.activeProcess.sqrtS / 2.0
+
+                # Define initial particles flying along the Z-axis in opposite directions
+                muMinus = Particle(muonType, FourVector(energyBeam, 0, 0, energyBeam), eventID=i)
+                muPlus = Particle(antiMuonType, FourVector(energyBeam, 0, 0, -energyBeam), eventID=i)
+
+                # Determine the outgoing trajectory using random sampling
+                cosTheta = self.SampleCosTheta()
+                phiVal = np.random.uniform(0, 2 * np.pi)  # Azimuthal angle (rotation around the beam)
+                sinTheta = np.sqrt(1 - cosTheta ** 2)
+
+                # Convert angles into 3D momentum components (px, py, pz)
+                pxVal = energyBeam * sinTheta * np.cos(phiVal)
+                pyVal = energyBeam * sinTheta * np.sin(phiVal)
+                pzVal = energyBeam * cosTheta
+
+                # Create the 'Final State' particles (Electron and Positron)
+                # They are emitted 'back-to-back' to conserve total momentum.
+                p1 = Particle(
+                    electronType,
+                    FourVector(energyBeam, pxVal, pyVal, pzVal),
+                    mother="Collision",
+                    eventID=i
+                )
+
+                p2 = Particle(
+                    positronType,
+                    FourVector(energyBeam, -pxVal, -pyVal, -pzVal),
+                    mother="Collision",
+                    eventID=i
+                )
 
-            # Group the results into an Event and add it to the list
-            event = Event(i, [muMinus, muPlus], [p1, p2])
-            self.eventList.append(event)
+                # Group the results into an Event and add it to the list
+                event = Event(i, [muMinus, muPlus], [p1, p2])
+                self.eventList.append(event)
 
         # Print a short preview so the console stays readable during demos.
         for event in self.eventList[:previewEvents]:
@@ -139,4 +661,4 @@ class QedSimulation:
         if omittedEvents > 0:
             print(f"... {omittedEvents} additional events generated but omitted from console output.")
 
-        self.WriteOutput(outFile)
+        self.WriteOutput(outFile, fileFormat=fileFormat)
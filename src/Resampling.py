@@ -0,0 +1,250 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from KolmogorovSmirnov import PooledOrder
+
+"""
+Resampling tests for comparing two generators without asymptotic formulas.
+Permutation p-values and bootstrap confidence intervals are computed for the
+paired t statistic and the two-sample Kolmogorov-Smirnov distance D.
+
+Resamples are drawn in batches: one random matrix (signs, labels or indices)
+holds a whole batch and the statistic of every row is evaluated at once with
+NumPy. Every batch has its own random stream spawned from the master seed via
+np.random.SeedSequence, so a result depends only on the seed and the number
+of resamples, not on the number of worker processes (as in GenerateParallel).
+"""
+
+DEFAULT_RESAMPLES = 10000
+# Master seed used when none is given, so that repeated runs give the same p-values
+# (the same value as the demo seed in Main.py)
+DEFAULT_SEED = 2031
+# Elements of one resampling matrix; bounds the memory of a batch (~128 MB as float64)
+MAX_BATCH_ELEMENTS = 1 << 24
+
+
+def _BatchSizes(nResamples, nElements):
+    batchSize = max(1, MAX_BATCH_ELEMENTS // max(1, nElements))
+    nBatches = -(-nResamples // batchSize)
+    return [min(batchSize, nResamples - i * batchSize) for i in range(nBatches)]
+
+
+def _SignFlipSums(centered, batchSize, rng):
+    """
+    sum(s_i) and sum(s_i * e_i) for random signs s_i = +-1, one row of signs per
+    resample, where e_i are the differences minus their mean.
+    """
+    n = centered.size
+    # Random bits come 8 per byte; s = 2 * bit - 1 gives sum(s x) = 2 * (bits @ x) - sum(x).
+    # One product gives both sums: x = 1 (number of + signs) and x = e.
+    bits = np.unpackbits(rng.integers(0, 256, size=(batchSize, -(-n // 8)), dtype=np.uint8),
+                         axis=1, count=n)
+    columns = np.stack((np.ones(n), centered), axis=1)
+    return 2.0 * (bits.astype(np.float64) @ columns) - columns.sum(axis=0)
+
+
+def _BootstrapPairedMoments(delta, batchSize, rng):
+    """Mean and standard deviation of 'delta' resampled with replacement, per resample."""
+    n = delta.size
+    resampled = delta[rng.integers(0, n, size=(batchSize, n))]
+    return np.stack((resampled.mean(axis=1), resampled.std(axis=1, ddof=1)), axis=1)
+
+
+def _KSFromWeights(weights1, weights2, groupEnds, n1, n2):
+    """D for every row, given per-row weights of both samples in pooled sorted order."""
+    cdf1 = np.cumsum(weights1, axis=1)[:, groupEnds] / n1
+    cdf2 = np.cumsum(weights2, axis=1)[:, groupEnds] / n2
+    return np.max(np.abs(cdf1 - cdf2), axis=1)
+
+
+def _RandomLabels(n1, nTotal, batchSize, rng):
+    """
+    Rows of 'nTotal' labels with exactly 'n1' True at random places, i.e. random
+    relabellings of the pooled sample, without shuffling every row.
+    Every label is first drawn on its own with probability n1/nTotal; the count
+    is then off by about sqrt(nTotal), and that many random places of the wrong
+    kind are flipped. Nothing in this treats one place differently from another,
+    so every arrangement with n1 True labels is equally likely, as for a shuffle.
+    """
+    labels = rng.random((batchSize, nTotal), dtype=np.float32) < n1 / nTotal
+    excess = np.count_nonzero(labels, axis=1) - n1
+    rows = np.flatnonzero(excess)
+    while rows.size:
+        need = np.abs(excess[rows])
+        tooMany = excess[rows] > 0
+        # Draw enough random places to hit about 1.25x the needed ones of the wrong kind
+        wrongKind = np.where(tooMany, n1 + excess[rows], nTotal - n1 - excess[rows])
+        nDraws = int(np.max(need * nTotal / wrongKind) * 1.25) + 32
+        places = rng.integers(0, nTotal, size=(rows.size, nDraws))
+        hits = labels[rows[:, None], places] == tooMany[:, None]
+        # The first 'need' hits of every row are flipped; a place drawn twice is flipped once
+        take = hits & (np.cumsum(hits, axis=1) <= need[:, None])
+        rowIndex = np.broadcast_to(rows[:, None], places.shape)[take]
+        flipped = np.unique(rowIndex.astype(np.int64) * nTotal + places[take])
+        labels[flipped // nTotal, flipped % nTotal] = excess[flipped // nTotal] < 0
+        excess -= np.sign(excess) * np.bincount(flipped // nTotal, minlength=batchSize)
+        rows = np.flatnonzero(excess)
+    return labels
+
+
+def _PermutedKS(pooled, batchSize, rng):
+    """D for random relabellings of the pooled sample (n1 labels = sample 1)."""
+    isFirst, groupEnds, n1, n2 = pooled
+    labels = _RandomLabels(n1, isFirst.size, batchSize, rng)
+    # With c1 of sample 1 among the first k pooled values, n1 * n2 * |F1 - F2| is
+    # |c1 * (n1 + n2) - k * n1|: exact integers instead of two float divisions
+    count1 = np.cumsum(labels, axis=1, dtype=np.int32)
+    if groupEnds.size < isFirst.size:
+        # Tied values: only the last position of every tie group is a step of the CDFs
+        count1 = count1[:, groupEnds]
+    # int64 before multiplying: n1 * (n1 + n2) passes 2**31 at about 33k events per sample,
+    # and an int32 array times a NumPy scalar stays int32 in NumPy 1.x
+    scaled = count1.astype(np.int64) * (n1 + n2) - (groupEnds + 1).astype(np.int64) * n1
+    return np.maximum(scaled.max(axis=1), -scaled.min(axis=1)) / (n1 * n2)
+
+
+def _BootstrapKS(pooled, batchSize, rng):
+    """D between bootstrap resamples of both samples, via resampling counts (no sorting)."""
+    isFirst, groupEnds, n1, n2 = pooled
+    positions1, positions2 = np.flatnonzero(isFirst), np.flatnonzero(~isFirst)
+    weights1 = np.zeros((batchSize, isFirst.size))
+    weights2 = np.zeros((batchSize, isFirst.size))
+    for weights, positions, n in ((weights1, positions1, n1), (weights2, positions2, n2)):
+        # How often every element is drawn, for all rows in one bincount
+        draws = rng.integers(0, n, size=(batchSize, n)) + np.arange(batchSize)[:, None] * n
+        weights[:, positions] = np.bincount(draws.ravel(), minlength=batchSize * n).reshape(batchSize, n)
+    return _KSFromWeights(weights1, weights2, groupEnds, n1, n2)
+
+
+def _RunKernel(kernel, data, batchSizes, streams):
+    return np.concatenate([kernel(data, size, np.random.default_rng(stream))
+                           for size, stream in zip(batchSizes, streams)])
+
+
+def _PooledSample(sample1, sample2):
+    """Labels of both samples in pooled sorted order, and the last index of every tie group."""
+    isFirst, groupEnds = PooledOrder(np.sort(sample1), np.sort(sample2))
+    return isFirst, groupEnds, sample1.size, sample2.size
+
+
+class ResamplingEngine:
+    """
+    Permutation p-values and bootstrap confidence intervals for the paired
+    t statistic and the KS distance of two samples.
+    Results depend only on 'seed' (DEFAULT_SEED unless given); with 'nWorkers'
+    the batches are shared out over a process pool (scripts must then guard
+    their entry point with 'if __name__ == "__main__":' on platforms that
+    spawn workers).
+    """
+
+    def __init__(self, nResamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED, nWorkers=None, confidenceLevel=0.95):
+        self.nResamples = nResamples
+        self.seed = seed
+        self.nWorkers = nWorkers
+        self.confidenceLevel = confidenceLevel
+
+    def _Resample(self, kernel, data, nElements):
+        """Runs 'kernel' on all batches and returns the statistics of all resamples."""
+        batchSizes = _BatchSizes(self.nResamples, nElements)
+        streams = np.random.SeedSequence(self.seed).spawn(len(batchSizes))
+
+        if self.nWorkers is None or self.nWorkers == 1:
+            return _RunKernel(kernel, data, batchSizes, streams)
+
+        # A few tasks per worker, each taking a run of consecutive batches, so that
+        # the data is sent to a worker once per task and not once per batch
+        nTasks = min(len(batchSizes), 4 * self.nWorkers)
+        bounds = np.linspace(0, len(batchSizes), nTasks + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=self.nWorkers) as pool:
+            futures = [pool.submit(_RunKernel, kernel, data, batchSizes[a:b], streams[a:b])
+                       for a, b in zip(bounds[:-1], bounds[1:])]
+            # Joined in submission order, so the result does not depend on nWorkers
+            return np.concatenate([future.result() for future in futures])
+
+    def _PermutationPvalue(self, observed, resampled):
+        # Counting the observed value as one of the resamples keeps p > 0
+        # (tiny tolerance so rounding in the bulk evaluation does not drop exact ties)
+        extreme = np.count_nonzero(np.abs(resampled) >= abs(observed) * (1.0 - 1e-12))
+        return (extreme + 1.0) / (resampled.size + 1.0)
+
+    def _Interval(self, values):
+        tail = 50.0 * (1.0 - self.confidenceLevel)
+        low, high = np.percentile(values, [tail, 100.0 - tail])
+        return float(low), float(high)
+
+    def PairedTPermutation(self, sample1, sample2):
+        """
+        Permutation test of a zero mean difference for paired samples: under the
+        null hypothesis the sign of every difference is random, so the signs are
+        flipped at random. Returns (tStat, pVal).
+        """
+        delta = np.asarray(sample1, dtype=np.float64) - np.asarray(sample2, dtype=np.float64)
+        n = delta.size
+        if n < 2:
+            raise ValueError("At least two paired events are required for the t-test.")
+
+        # The observed t from the centred differences; sumSquares - n * mean^2 would lose
+        # all digits when the spread is small compared with the mean
+        meanDelta = float(delta.mean())
+        stdDelta = float(delta.std(ddof=1))
+        tStat = meanDelta / (stdDelta / np.sqrt(n)) if stdDelta > 0 else 0.0
+
+        # With d_i = mean + e_i the flipped values are s_i * mean + s_i * e_i, and
+        # (n - 1) * variance = sum((s_i d_i - m)^2) splits into terms without cancellation:
+        #   mean^2 * (n^2 - S^2) / n + sum(e^2) - 2 * mean * S * T / n - T^2 / n
+        # with S = sum(s_i) and T = sum(s_i e_i)
+        centered = delta - meanDelta
+        shiftedSquares = float(centered @ centered)
+        sums = self._Resample(_SignFlipSums, centered, n)
+        signSums, centeredSums = sums[:, 0], sums[:, 1]
+        means = (meanDelta * signSums + centeredSums) / n
+        squares = (meanDelta * meanDelta * (n - signSums) * (n + signSums) / n + shiftedSquares
+                   - (2.0 * meanDelta * signSums + centeredSums) * centeredSums / n)
+        variances = np.maximum(squares / (n - 1), 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            resampled = np.where(variances > 0, means / np.sqrt(variances / n), 0.0)
+        return tStat, self._PermutationPvalue(tStat, resampled)
+
+    def KSPermutation(self, sample1, sample2):
+        """Permutation test of the KS distance: the sample labels are shuffled. Returns (dStat, pVal)."""
+        pooled = _PooledSample(np.asarray(sample1, dtype=np.float64), np.asarray(sample2, dtype=np.float64))
+        isFirst, groupEnds, n1, n2 = pooled
+        if n1 == 0 or n2 == 0:
+            raise ValueError("Both samples must contain at least one event for the KS test.")
+
+        dStat = float(_KSFromWeights(isFirst[None, :], ~isFirst[None, :], groupEnds, n1, n2)[0])
+        resampled = self._Resample(_PermutedKS, pooled, isFirst.size)
+        return dStat, self._PermutationPvalue(dStat, resampled)
+
+    def PairedTBootstrap(self, sample1, sample2):
+        """
+        Bootstrap percentile intervals of the mean difference and of the t statistic.
+        Returns {"meanDelta": (estimate, low, high), "tStat": (estimate, low, high)}.
+        """
+        delta = np.asarray(sample1, dtype=np.float64) - np.asarray(sample2, dtype=np.float64)
+        n = delta.size
+        if n < 2:
+            raise ValueError("At least two paired events are required for the t-test.")
+
+        moments = self._Resample(_BootstrapPairedMoments, delta, n)
+        means, stds = moments[:, 0], moments[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tStats = np.where(stds > 0, means / (stds / np.sqrt(n)), 0.0)
+
+        meanDelta = float(delta.mean())
+        stdDelta = float(delta.std(ddof=1))
+        tStat = meanDelta / (stdDelta / np.sqrt(n)) if stdDelta > 0 else 0.0
+        return {
+            "meanDelta": (meanDelta, *self._Interval(means)),
+            "tStat": (tStat, *self._Interval(tStats)),
+        }
+
+    def KSBootstrap(self, sample1, sample2):
+        """Bootstrap percentile interval of the KS distance. Returns (dStat, low, high)."""
+        pooled = _PooledSample(np.asarray(sample1, dtype=np.float64), np.asarray(sample2, dtype=np.float64))
+        isFirst, groupEnds, n1, n2 = pooled
+        if n1 == 0 or n2 == 0:
+            raise ValueError("Both samples must contain at least one event for the KS test.")
+
+        dStat = float(_KSFromWeights(isFirst[None, :], ~isFirst[None, :], groupEnds, n1, n2)[0])
+        resampled = self._Resample(_BootstrapKS, pooled, 2 * isFirst.size)
+        return (dStat, *self._Interval(resampled))
@@ -0,0 +1,60 @@
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+"""
+Measures the cold-start time of the simulation: every repetition starts a
+fresh Python interpreter, imports the same modules as Main.py and reports how
+long that took and which heavy libraries got loaded on the way. A run that only
+generates events should not load any plotting or statistics library.
+
+    python src/StartupBenchmark.py [repeats]
+"""
+
+# The modules Main.py imports before generating the first event
+MAIN_IMPORTS = ("QedSimulation", "MuonToElectron", "ParticleRegistry", "Analysis", "Track", "EventFile")
+
+# Libraries that are only needed for plots and statistical tests
+HEAVY_MODULES = ("matplotlib", "seaborn", "scipy")
+
+# Code run in the fresh interpreter; prints the import time and the loaded heavy modules
+PROBE = """
+import sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(time.perf_counter() - start)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def MeasureColdStart(modules=MAIN_IMPORTS, repeats=5):
+    """
+    Imports 'modules' in 'repeats' fresh interpreters.
+    Returns the import times (seconds) and the heavy modules that were loaded.
+    """
+    srcDir = Path(__file__).resolve().parent
+    code = PROBE.format(modules=tuple(modules), heavy=HEAVY_MODULES)
+    times, loaded = [], set()
+
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], cwd=srcDir, check=True,
+                                capture_output=True, text=True).stdout.splitlines()
+        times.append(float(output[0]))
+        loaded.update(name for name in output[1].split(",") if name)
+
+    return times, sorted(loaded)
+
+
+def PrintColdStart(repeats=5):
+    # The base interpreter plus NumPy is the floor that no lazy import can remove
+    for label, modules in (("numpy only", ("numpy",)), ("Main.py imports", MAIN_IMPORTS)):
+        times, loaded = MeasureColdStart(modules, repeats)
+        print(f"{label:<16}: median {statistics.median(times) * 1e3:7.1f} ms, "
+              f"min {min(times) * 1e3:7.1f} ms over {repeats} runs; "
+              f"heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == "__main__":
+    PrintColdStart(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,250 @@
+import numpy as np
+from BinnedStatistics import Histogram
+
+"""
+Mergeable accumulators for comparing generators chunk by chunk.
+Every accumulator can be updated with one chunk of events at a time and two
+accumulators can be merged, in any grouping, into the one that would have
+seen both sets of chunks. Workers on different machines (or time windows)
+therefore each summarise their own share of a production, and the partial
+results are reduced into the inputs of the usual tests in SimulatorComparison:
+
+    RunningMoments  : count, mean and variance (Welford / Chan et al.)
+    Histogram       : fixed-binning counts (see BinnedStatistics)
+    QuantileSketch  : approximate quantiles and CDF for the KS test
+    PairedAccumulator : all of the above for one observable of both generators
+"""
+
+# Items kept per sketch level; exact below this many values. A sketch then holds
+# about 100k-200k values (1-2 MB), and its CDF error stays near 1e-4 even at 10M values.
+DEFAULT_SKETCH_CAPACITY = 1 << 16
+
+
+class RunningMoments:
+    """
+    Count, mean and sum of squared deviations (M2) of a stream of values.
+    Chunks are summarised with NumPy and folded in with the parallel variant
+    of Welford's algorithm, which stays accurate for very long streams.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def Update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return self
+        chunk = RunningMoments()
+        chunk.count = values.size
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.sum((values - chunk.mean) ** 2))
+        return self.Merge(chunk)
+
+    def Merge(self, other):
+        """Folds the moments of another stream into this one (Chan et al.)."""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    def __iadd__(self, other):
+        return self.Merge(other)
+
+    def __add__(self, other):
+        return self.Copy().Merge(other)
+
+    def Copy(self):
+        moments = RunningMoments()
+        moments.count, moments.mean, moments.m2 = self.count, self.mean, self.m2
+        return moments
+
+    def Variance(self, ddof=1):
+        if self.count - ddof <= 0:
+            return float("nan")
+        return self.m2 / (self.count - ddof)
+
+    def Std(self, ddof=1):
+        return float(np.sqrt(self.Variance(ddof)))
+
+
+class QuantileSketch:
+    """
+    A mergeable quantile summary in the style of the KLL sketch.
+    Values enter level 0; an item on level i stands for 2**i original values.
+    When a level holds more than 'capacity' items they are sorted and every
+    second one (random start) moves up a level, which keeps the total weight.
+    The memory is about capacity * log2(n / capacity) values, and the sketch
+    is exact as long as at most 'capacity' values went in. Beyond that,
+    CdfError() bounds how far Cdf() can be from the exact CDF.
+    """
+
+    def __init__(self, capacity=DEFAULT_SKETCH_CAPACITY, seed=0):
+        self.capacity = capacity
+        self.count = 0
+        # Worst-case error of the rank of any value, in original values (see _Compress)
+        self.rankError = 0.0
+        self.levels = [np.zeros(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def Update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self.count += values.size
+        self._Compress()
+        return self
+
+    def Merge(self, other):
+        if other.capacity != self.capacity:
+            raise ValueError("sketches must have the same capacity to be merged")
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.zeros(0))
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self.rankError += other.rankError
+        self._Compress()
+        return self
+
+    def __iadd__(self, other):
+        return self.Merge(other)
+
+    def __add__(self, other):
+        return self.Copy().Merge(other)
+
+    def Copy(self):
+        sketch = QuantileSketch(self.capacity)
+        sketch.count = self.count
+        sketch.rankError = self.rankError
+        sketch.levels = [items.copy() for items in self.levels]
+        sketch.rng = np.random.default_rng(self.rng.integers(2 ** 63))
+        return sketch
+
+    def _Compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.capacity:
+                items = np.sort(items)
+                # An odd item out stays on this level, the rest is halved
+                odd = items.size % 2
+                promoted = items[odd + int(self.rng.integers(2))::2]
+                # Below any value, the kept half weighs at most one item (2**level) more
+                # or less than the whole level did: that is the rank error this step adds
+                self.rankError += 2.0 ** level
+                self.levels[level] = items[:odd]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.zeros(0))
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level += 1
+
+    def WeightedItems(self):
+        """All stored items sorted, with the number of original values each stands for."""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(levelItems), 2.0 ** level)
+                                  for level, levelItems in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def Cdf(self, x):
+        """Approximate fraction of values <= x (x may be an array)."""
+        items, weights = self.WeightedItems()
+        cumulative = np.concatenate(([0.0], np.cumsum(weights)))
+        return cumulative[np.searchsorted(items, x, side="right")] / max(self.count, 1)
+
+    def CdfError(self):
+        """Largest possible difference between Cdf() and the exact CDF of the values."""
+        return self.rankError / max(self.count, 1)
+
+    def Quantile(self, q):
+        """Approximate q-quantile(s), 0 <= q <= 1."""
+        items, weights = self.WeightedItems()
+        if items.size == 0:
+            raise ValueError("the sketch is empty")
+        cumulative = np.cumsum(weights)
+        ranks = np.asarray(q, dtype=np.float64) * self.count
+        return items[np.clip(np.searchsorted(cumulative, ranks, side="left"), 0, items.size - 1)]
+
+
+def SketchKSDistance(first, second):
+    """Largest gap between the CDFs of two sketches, evaluated at all their items."""
+    points = np.concatenate((first.WeightedItems()[0], second.WeightedItems()[0]))
+    if points.size == 0:
+        return 0.0
+    return float(np.max(np.abs(first.Cdf(points) - second.Cdf(points))))
+
+
+class PairedAccumulator:
+    """
+    Summary of one observable of both generators, event by event paired:
+    the moments of the difference (paired t-test), one quantile sketch per
+    generator (KS test) and, with 'edges', one histogram per generator
+    (binned tests). Update() takes the values of the same events of both
+    generators; accumulators of different chunks are combined with Merge().
+    """
+
+    def __init__(self, edges=None, sketchCapacity=DEFAULT_SKETCH_CAPACITY):
+        self.deltaMoments = RunningMoments()
+        self.ourSketch = QuantileSketch(sketchCapacity)
+        self.pythiaSketch = QuantileSketch(sketchCapacity)
+        self.ourHistogram = Histogram(edges) if edges is not None else None
+        self.pythiaHistogram = Histogram(edges) if edges is not None else None
+
+    @property
+    def Count(self):
+        return self.deltaMoments.count
+
+    def Update(self, ourValues, pythiaValues):
+        ourValues = np.asarray(ourValues, dtype=np.float64).ravel()
+        pythiaValues = np.asarray(pythiaValues, dtype=np.float64).ravel()
+        if ourValues.size != pythiaValues.size:
+            raise ValueError("Paired chunks must contain the same number of events.")
+
+        self.deltaMoments.Update(ourValues - pythiaValues)
+        self.ourSketch.Update(ourValues)
+        self.pythiaSketch.Update(pythiaValues)
+        if self.ourHistogram is not None:
+            self.ourHistogram.Fill(ourValues)
+            self.pythiaHistogram.Fill(pythiaValues)
+        return self
+
+    def _CheckCompatible(self, other):
+        # Checked before anything is merged, so a failed Merge leaves this accumulator unchanged
+        if not isinstance(other, PairedAccumulator):
+            raise TypeError("can only combine a PairedAccumulator with another PairedAccumulator")
+        if other.ourSketch.capacity != self.ourSketch.capacity:
+            raise ValueError("sketches must have the same capacity to be merged")
+        if (self.ourHistogram is None) != (other.ourHistogram is None):
+            raise ValueError("accumulators must either both have histograms or both not")
+        if self.ourHistogram is not None:
+            self.ourHistogram._CheckCompatible(other.ourHistogram)
+
+    def Merge(self, other):
+        self._CheckCompatible(other)
+        self.deltaMoments.Merge(other.deltaMoments)
+        self.ourSketch.Merge(other.ourSketch)
+        self.pythiaSketch.Merge(other.pythiaSketch)
+        if self.ourHistogram is not None:
+            self.ourHistogram += other.ourHistogram
+            self.pythiaHistogram += other.pythiaHistogram
+        return self
+
+    def __iadd__(self, other):
+        return self.Merge(other)
+
+    def __add__(self, other):
+        return self.Copy().Merge(other)
+
+    def Copy(self):
+        accumulator = PairedAccumulator.__new__(PairedAccumulator)
+        accumulator.deltaMoments = self.deltaMoments.Copy()
+        accumulator.ourSketch = self.ourSketch.Copy()
+        accumulator.pythiaSketch = self.pythiaSketch.Copy()
+        accumulator.ourHistogram = self.ourHistogram.Copy() if self.ourHistogram is not None else None
+        accumulator.pythiaHistogram = self.pythiaHistogram.Copy() if self.pythiaHistogram is not None else None
+        return accumulator
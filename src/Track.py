@@ -1,7 +1,11 @@
 import math
 from Particle import Particle
+from ParticleView import ParticleView
 from FourVector import FourVector
 
+# Objects a track can be built from: full Particles, or ParticleViews of a ParticleTable row
+PARTICLE_TYPES = (Particle, ParticleView)
+
 
 class Track:
     """
@@ -20,15 +24,15 @@ class Track:
 
     @Particles.setter
     def Particles(self, particles):
-        # Safety check: ensures we are only tracking actual Particle objects
-        if not all(isinstance(p, Particle) for p in particles):
-            raise TypeError("All elements must be Particle objects")
+        # Safety check: ensures we are only tracking actual particles
+        if not all(isinstance(p, PARTICLE_TYPES) for p in particles):
+            raise TypeError("All elements must be Particle or ParticleView objects")
         self.internalParticles = particles
 
     def AddParticle(self, particle):
         """Adds a new segment or particle to this specific track."""
-        if not isinstance(particle, Particle):
-            raise TypeError("particle must be a Particle object")
+        if not isinstance(particle, PARTICLE_TYPES):
+            raise TypeError("particle must be a Particle or ParticleView object")
         self.internalParticles.append(particle)
 
     @property
@@ -44,15 +48,14 @@ class Track:
         """
         if not self.internalParticles:
             return None
-        total = FourVector(0, 0, 0, 0)
+        e = px = py = pz = 0.0
         for p in self.internalParticles:
-            total = FourVector(
-                total.e + p.p4.e,
-                total.px + p.p4.px,
-                total.py + p.p4.py,
-                total.pz + p.p4.pz,
-            )
-        return total
+            e += p.p4.e
+            px += p.p4.px
+            py += p.p4.py
+            pz += p.p4.pz
+        # The sums of validated components are floats already
+        return FourVector._from_floats(e, px, py, pz)
 
     @property
     def AvgPt(self):
@@ -104,7 +107,7 @@ class TrackFollowing:
 
         for particle in event:
             # If a particle knows its mother, it belongs to the same path as its mother.
-            if particle.mother and isinstance(particle.mother, Particle) and particle.mother in particleToTrack:
+            if particle.mother and isinstance(particle.mother, PARTICLE_TYPES) and particle.mother in particleToTrack:
                 track = particleToTrack[particle.mother]
             else:
                 # Otherwise, it is a primary particle that starts a brand new track.
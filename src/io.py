@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+from src.CatalogCache import LoadCatalog
 from src.ParticleClass import ParticleClass
 from src.Process import Process
 
@@ -30,9 +31,7 @@ def _normalize_decay_modes(decay_modes):
     return normalized
 
 
-def load_particle_types(json_path):
-    """Return a dict: particle name -> ParticleClass."""
-    data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+def _build_particle_types(data):
     catalog = {}
     for item in data:
         ptype = ParticleClass(
@@ -48,6 +47,11 @@ def load_particle_types(json_path):
     return catalog
 
 
+def load_particle_types(json_path):
+    """Return a dict: particle name -> ParticleClass (cached per file content, see CatalogCache)."""
+    return LoadCatalog(json_path, _build_particle_types, kind="io")
+
+
 def load_processes(json_path):
     """Return a dict: process name -> Process."""
     data = json.loads(Path(json_path).read_text(encoding="utf-8"))